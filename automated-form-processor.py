@@ -6,35 +6,32 @@ Identifies and processes legal forms automatically
 
 import json
 import re
+import os
+import fcntl
+import time
 from pathlib import Path
 from datetime import datetime
+from form_classifier import CLASSIFIER
+
+# Bytes read per file by the scheduling prefilter
+PREFILTER_BYTES = 4096
 
 class AutomatedFormProcessor:
     def __init__(self):
         self.forms_dir = Path("/Users/owner/GitHub/SYNC/case-management/ontario-forms")
         self.intake_dir = Path("/Users/owner/GitHub/SYNC/case-management/archive/intake")
         self.processed_dir = Path("/Users/owner/GitHub/SYNC/case-management/archive/processed")
+        self.claims_dir = self.intake_dir / ".claims"
+        self.journal_file = self.processed_dir / "intake_journal.jsonl"
+        # Kept beside the journal, out of the user-facing intake folder
+        self.recover_lock_file = self.processed_dir / "intake_journal.lock"
         
-        # Form identification patterns
-        self.form_patterns = {
-            "Form_14A": r"FORM 14A|Affidavit.*General",
-            "Form_14": r"FORM 14|Application.*General",
-            "Form_14B": r"FORM 14B|Motion",
-            "Form_8": r"FORM 8|Financial Statement",
-            "Form_35_1": r"FORM 35.1|Affidavit.*Support",
-            "Form_6B": r"FORM 6B|Continuing Record",
-            "Emergency_Motion": r"Emergency Motion|Urgent",
-            "Police_Report": r"Police.*Report|Incident Report",
-            "FACS_Complaint": r"FACS|Family.*Children.*Services",
-            "Supreme_Court": r"Supreme Court|Leave to Appeal"
-        }
+        # Shared, precompiled form identification rules
+        self.classifier = CLASSIFIER
     
-    def identify_form_type(self, content):
-        """Identify form type from content"""
-        for form_type, pattern in self.form_patterns.items():
-            if re.search(pattern, content, re.IGNORECASE):
-                return form_type
-        return "Unknown"
+    def identify_form_type(self, content, filename=""):
+        """Identify form type from content (most specific match wins)"""
+        return self.classifier.identify_form_type(content, filename)
     
     def extract_case_info(self, content):
         """Extract key case information"""
@@ -57,43 +54,202 @@ class AutomatedFormProcessor:
         
         return info
     
-    def process_intake_files(self):
-        """Process files in intake directory"""
-        if not self.intake_dir.exists():
+    def append_journal(self, record):
+        """Durably append one processing record to the intake journal"""
+        with open(self.journal_file, 'a+b') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            
+            # Terminate a line torn by an earlier crash so this record stays readable
+            end = f.seek(0, os.SEEK_END)
+            if end:
+                f.seek(end - 1)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+                    
+            f.write((json.dumps(record) + "\n").encode('utf-8'))
+            f.flush()
+            os.fsync(f.fileno())
+            fcntl.flock(f, fcntl.LOCK_UN)
+    
+    def read_journal(self):
+        """Read all journaled records not yet included in a report"""
+        if not self.journal_file.exists():
             return []
         
-        processed_files = []
+        records = []
+        with open(self.journal_file, 'r') as f:
+            fcntl.flock(f, fcntl.LOCK_SH)
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue  # torn line from a crash mid-write
+            fcntl.flock(f, fcntl.LOCK_UN)
+        return records
+    
+    def clear_journal(self, reported):
+        """Drop reported records, keeping any appended by other workers since"""
+        if not self.journal_file.exists():
+            return
+        
+        reported_ids = {record["record_id"] for record in reported}
+        with open(self.journal_file, 'r+') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            remaining = []
+            for line in f:
+                try:
+                    if json.loads(line)["record_id"] not in reported_ids:
+                        remaining.append(line)
+                except (ValueError, KeyError, TypeError):
+                    continue  # torn line from a crash mid-write; read_journal skips it too
+            f.seek(0)
+            f.truncate()
+            f.writelines(remaining)
+            f.flush()
+            os.fsync(f.fileno())
+            fcntl.flock(f, fcntl.LOCK_UN)
+    
+    def claim_file(self, file_path):
+        """Atomically claim an intake file for this worker; None if another got it"""
+        worker_dir = self.claims_dir / str(os.getpid())
+        claimed_path = worker_dir / file_path.name
+        for _ in range(3):
+            worker_dir.mkdir(parents=True, exist_ok=True)
+            try:
+                os.rename(file_path, claimed_path)
+                return claimed_path
+            except FileNotFoundError:
+                if not file_path.exists():
+                    break  # another worker claimed it first
+                # Another worker removed the empty claims folder in between
+        self.release_worker_dir()
+        return None
+    
+    def release_worker_dir(self):
+        """Remove this worker's claim directory, and the claims folder, once they hold no claimed files"""
+        for directory in (self.claims_dir / str(os.getpid()), self.claims_dir):
+            try:
+                directory.rmdir()
+            except OSError:
+                return  # still holds a claim, or already gone
+    
+    def recover_stale_claims(self):
+        """Finish or release files claimed by workers that are no longer running"""
+        if not self.claims_dir.exists():
+            return
+        
+        # One worker recovers at a time; the others then find nothing left to do
+        with open(self.recover_lock_file, 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            journaled = {record["claim_path"]: record for record in self.read_journal()}
+            try:
+                worker_dirs = list(self.claims_dir.iterdir())
+            except FileNotFoundError:
+                worker_dirs = []  # emptied and removed by another worker
+            
+            for worker_dir in worker_dirs:
+                if not worker_dir.name.isdigit():
+                    continue
+                pid = int(worker_dir.name)
+                if pid != os.getpid() and self.worker_alive(pid):
+                    continue
+                
+                for claimed_path in worker_dir.iterdir():
+                    record = journaled.get(str(claimed_path))
+                    if record:
+                        # Recorded before the crash; only the move is left
+                        claimed_path.rename(self.processed_dir / record["processed_name"])
+                    else:
+                        claimed_path.rename(self.intake_dir / claimed_path.name)
+                worker_dir.rmdir()
+            # Left in intake by earlier versions
+            (self.claims_dir / ".recover.lock").unlink(missing_ok=True)
+            fcntl.flock(lock, fcntl.LOCK_UN)
+        self.release_worker_dir()
+    
+    def worker_alive(self, pid):
+        """Check whether a worker process is still running"""
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+    
+    def schedule_intake_files(self):
+        """Order intake files by estimated priority using filename and first few KB"""
+        scheduled = []
         
         for file_path in self.intake_dir.glob("*"):
             if file_path.is_file():
                 try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    
-                    form_type = self.identify_form_type(content)
-                    case_info = self.extract_case_info(content)
-                    
-                    # Create processing record
-                    record = {
-                        "file_name": file_path.name,
-                        "form_type": form_type,
-                        "case_info": case_info,
-                        "processed_date": datetime.now().isoformat(),
-                        "file_size": file_path.stat().st_size,
-                        "relevance_score": self.calculate_relevance(content)
-                    }
-                    
-                    processed_files.append(record)
-                    
-                    # Move to processed directory
-                    self.processed_dir.mkdir(exist_ok=True)
-                    new_path = self.processed_dir / f"{form_type}_{file_path.name}"
-                    file_path.rename(new_path)
-                    
-                except Exception as e:
-                    print(f"Error processing {file_path}: {e}")
+                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                        prefix = f.read(PREFILTER_BYTES)
+                except OSError:
+                    continue  # claimed by another worker in the meantime
+                
+                estimates = self.classifier.identify_document_type(prefix, file_path.name)
+                priority = estimates[0]["priority"] if estimates else 0
+                scheduled.append((priority, file_path))
+        
+        # Emergency and court-deadline documents (priority 10) go first
+        scheduled.sort(key=lambda x: x[0], reverse=True)
+        return scheduled
+    
+    def process_intake_files(self):
+        """Process files in intake directory; safe to run in several processes at once"""
+        if not self.intake_dir.exists():
+            return []
+        
+        self.processed_dir.mkdir(parents=True, exist_ok=True)
+        self.recover_stale_claims()
         
-        return processed_files
+        batch_start = time.monotonic()
+        for priority, file_path in self.schedule_intake_files():
+            claimed_path = self.claim_file(file_path)
+            if not claimed_path:
+                continue
+            
+            journaled = False
+            try:
+                with open(claimed_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+                
+                form_type = self.identify_form_type(content, file_path.name)
+                case_info = self.extract_case_info(content)
+                
+                # Create processing record
+                record = {
+                    "record_id": f"{os.getpid()}-{datetime.now().timestamp()}-{file_path.name}",
+                    "file_name": file_path.name,
+                    "form_type": form_type,
+                    "case_info": case_info,
+                    "processed_date": datetime.now().isoformat(),
+                    "file_size": claimed_path.stat().st_size,
+                    "relevance_score": self.calculate_relevance(content),
+                    "priority": priority,
+                    "time_to_classify": time.monotonic() - batch_start,
+                    "claim_path": str(claimed_path),
+                    "processed_name": f"{form_type}_{file_path.name}"
+                }
+                
+                # Journal before the move so a crash can't lose the record
+                self.append_journal(record)
+                journaled = True
+                
+                # Move to processed directory
+                claimed_path.rename(self.processed_dir / record["processed_name"])
+                self.release_worker_dir()
+                
+            except Exception as e:
+                print(f"Error processing {file_path}: {e}")
+                if not journaled:
+                    claimed_path.rename(file_path)
+                    self.release_worker_dir()
+        
+        # Includes records from interrupted runs and other workers not yet reported
+        return self.read_journal()
     
     def calculate_relevance(self, content):
         """Calculate relevance score for legal content"""
@@ -116,6 +272,25 @@ class AutomatedFormProcessor:
         
         return min(score, 100)  # Cap at 100
     
+    def latency_by_priority(self, processed_files):
+        """Summarize time-to-classify (seconds from batch start) per priority class"""
+        by_priority = {}
+        for file_record in processed_files:
+            if "time_to_classify" in file_record:
+                by_priority.setdefault(file_record["priority"], []).append(file_record["time_to_classify"])
+        
+        distribution = {}
+        for priority in sorted(by_priority, reverse=True):
+            times = sorted(by_priority[priority])
+            distribution[str(priority)] = {
+                "count": len(times),
+                "min": times[0],
+                "p50": times[len(times) // 2],
+                "p90": times[min(len(times) - 1, int(len(times) * 0.9))],
+                "max": times[-1]
+            }
+        return distribution
+    
     def generate_processing_report(self, processed_files):
         """Generate automated processing report"""
         report = {
@@ -133,11 +308,15 @@ class AutomatedFormProcessor:
             if file_record["relevance_score"] >= 70:
                 report["high_relevance"].append(file_record["file_name"])
         
+        report["time_to_classify"] = self.latency_by_priority(processed_files)
+        
         # Save report
         report_path = self.forms_dir / "automated_processing_report.json"
         with open(report_path, 'w') as f:
             json.dump(report, f, indent=2)
         
+        self.clear_journal(processed_files)
+        
         return report
 
 if __name__ == "__main__":
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Automation Daemon
+Keeps the form identification system, the case manager and the compiled form
+signatures loaded, and runs jobs sent over a Unix domain socket so callers
+(auto-sync.js, sync-server.js, cron) don't pay interpreter startup per action
+
+Protocol: the client sends one JSON object per line and gets one JSON line back
+    {"job": "scan", "path": "/path/to/folder"}
+    {"job": "archive", "path": "/path/to/file", "category": "evidence/screenshots"}
+    {"job": "report", "kind": "identification" | "case_analysis" | "timeline" | "evidence" | "web"}
+    {"job": "status"}
+Responses are {"ok": true, "result": ...} or {"ok": false, "error": "..."}
+"""
+
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+from script_loader import load_script
+from form_classifier import CLASSIFIER
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+SOCKET_PATH = "/Users/owner/GitHub/SYNC/case-management/automation-daemon.sock"
+
+# Jobs beyond this many wait in line until a slot frees up
+MAX_CONCURRENT_JOBS = 2
+
+class AutomationDaemon:
+    def __init__(self, base_path="/Users/owner/GitHub/SYNC", socket_path=SOCKET_PATH,
+                 max_concurrent_jobs=MAX_CONCURRENT_JOBS):
+        self.base_path = Path(base_path)
+        self.socket_path = Path(socket_path)
+        self.started = datetime.now()
+        self.job_slots = threading.Semaphore(max_concurrent_jobs)
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self.stats_lock = threading.Lock()
+        self.stats = {"completed": 0, "failed": 0, "running": 0, "queued": 0}
+
+        # Loaded once for the life of the daemon
+        identification = load_script(SCRIPT_DIR / "form-identification-system.py")
+        automation = load_script(SCRIPT_DIR / "enhanced-automation.py")
+        self.identifier = identification.FormIdentificationSystem()
+        self.identification_dirs = [
+            self.base_path / "case-management" / "archive",
+            self.base_path / "INGEST",
+            self.base_path / "solecaregiverontario" / "approved"
+        ]
+        self.manager = automation.EnhancedCaseManager(str(self.base_path))
+
+        # The case manager buffers metadata and aggregates, so its jobs run one at a time.
+        # Each job starts from the index and aggregates on disk, since cron runs and the
+        # integration manager archive into the same case folder while the daemon is up
+        self.manager_lock = threading.Lock()
+
+        self.jobs = {
+            "scan": self.job_scan,
+            "archive": self.job_archive,
+            "report": self.job_report,
+            "status": self.job_status
+        }
+
+    def handle_request(self, request):
+        """Run one job request, waiting for a free slot first"""
+        handler = self.jobs.get(request.get("job"))
+        if handler is None:
+            return {"ok": False, "error": f"Unknown job: {request.get('job')}"}
+
+        # Status answers immediately, even when every slot is busy
+        if handler == self.job_status:
+            return {"ok": True, "result": handler(request)}
+
+        self.update_stats(queued=1)
+        with self.job_slots:
+            self.update_stats(queued=-1, running=1)
+            try:
+                result = handler(request)
+                self.update_stats(running=-1, completed=1)
+                return {"ok": True, "result": result}
+            except Exception as e:
+                self.update_stats(running=-1, failed=1)
+                return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+    def update_stats(self, **changes):
+        with self.stats_lock:
+            for key, change in changes.items():
+                self.stats[key] += change
+
+    def job_scan(self, request):
+        """Identify every document under a folder"""
+        processed = self.identifier.process_directory(request["path"])
+        return {
+            "files_analyzed": len(processed),
+            "files": [
+                {
+                    "file_path": analysis["file_path"],
+                    "document_type": analysis["document_types"][0]["document_type"] if analysis["document_types"] else "Unknown",
+                    "relevance_score": analysis["relevance_score"]
+                }
+                for analysis in processed
+            ]
+        }
+
+    def job_archive(self, request):
+        """Categorize and archive a single file"""
+        source_path = Path(request["path"])
+        if not source_path.is_file():
+            raise FileNotFoundError(f"No such file: {source_path}")
+
+        with self.manager_lock:
+            self.manager.refresh_shared_state()
+            category = request.get("category") or self.manager.smart_categorize_file(source_path)
+            archived = self.manager.archive_file(source_path, category)
+            self.manager.flush_metadata()
+        return {"archived": archived, "category": category}
+
+    def job_report(self, request):
+        """Regenerate one of the case reports"""
+        kind = request.get("kind", "identification")
+
+        if kind == "identification":
+            processed = []
+            for directory in self.identification_dirs:
+                processed.extend(self.identifier.process_directory(directory))
+            report = self.identifier.generate_identification_report(processed)
+            return {"total_files_analyzed": report["total_files_analyzed"]}
+
+        with self.manager_lock:
+            self.manager.refresh_shared_state()
+            if kind == "case_analysis":
+                report = self.manager.generate_case_analysis_report()
+                return {"case_strength_score": report.get("analysis_summary", {}).get("case_strength_score", 0)}
+            if kind == "timeline":
+                return {"timeline_events": len(self.manager.generate_comprehensive_timeline())}
+            if kind == "evidence":
+                return {"total_files": self.manager.generate_evidence_database().get("total_files", 0)}
+            if kind == "web":
+                return {"synced": bool(self.manager.sync_with_web_interface())}
+
+        raise ValueError(f"Unknown report kind: {kind}")
+
+    def job_status(self, request):
+        with self.stats_lock:
+            stats = dict(self.stats)
+        return {
+            "pid": os.getpid(),
+            "started": self.started.isoformat(),
+            "uptime_seconds": (datetime.now() - self.started).total_seconds(),
+            "max_concurrent_jobs": self.max_concurrent_jobs,
+            "form_signatures": len(CLASSIFIER.rules),
+            **stats
+        }
+
+    def serve(self):
+        """Listen on the socket until interrupted"""
+        if self.socket_path.exists():
+            try:
+                send_job({"job": "status"}, self.socket_path)
+                print(f"❌ A daemon is already listening on {self.socket_path}")
+                return False
+            except OSError:
+                # Left behind by a daemon that didn't shut down cleanly
+                self.socket_path.unlink()
+
+        daemon = self
+
+        class JobHandler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    if not line.strip():
+                        continue
+                    try:
+                        response = daemon.handle_request(json.loads(line))
+                    except ValueError as e:
+                        response = {"ok": False, "error": f"Invalid request: {e}"}
+                    self.wfile.write((json.dumps(response) + "\n").encode('utf-8'))
+                    self.wfile.flush()
+
+        server = socketserver.ThreadingUnixStreamServer(str(self.socket_path), JobHandler)
+        server.daemon_threads = True
+        os.chmod(self.socket_path, 0o600)
+
+        print(f"🟢 Automation daemon listening on {self.socket_path} "
+              f"({self.max_concurrent_jobs} concurrent jobs)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\n🛑 Automation daemon stopped")
+        finally:
+            server.server_close()
+            self.socket_path.unlink(missing_ok=True)
+        return True
+
+def send_job(request, socket_path=SOCKET_PATH):
+    """Send one job to a running daemon and return its response"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(str(socket_path))
+        client.sendall((json.dumps(request) + "\n").encode('utf-8'))
+        with client.makefile('r', encoding='utf-8') as responses:
+            return json.loads(responses.readline())
+
+def main():
+    """Main execution"""
+    if len(sys.argv) > 2 and sys.argv[1] == "--send":
+        response = send_job(json.loads(sys.argv[2]))
+        print(json.dumps(response, indent=2))
+        return response["ok"]
+
+    return AutomationDaemon().serve()
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -10,12 +10,89 @@ import datetime
 from pathlib import Path
 import shutil
 import re
+import fnmatch
+import bisect
+
+class FileRules:
+    """Include/exclude globs, size limit and pruned directories for file intake"""
+    
+    DEFAULTS = {
+        "include": [
+            "*.pdf", "*.doc", "*.docx", "*.rtf", "*.txt", "*.md", "*.odt",
+            "*.eml", "*.msg", "*.csv", "*.xls", "*.xlsx",
+            "*.png", "*.jpg", "*.jpeg", "*.gif", "*.heic",
+            "*.mov", "*.mp4", "*.m4a", "*.mp3", "*.wav", "*.zip"
+        ],
+        "exclude": ["~$*", "*.tmp", "*.part", "*.crdownload"],
+        "max_size_mb": 50,
+        "prune_dirs": [
+            "node_modules", ".git", ".svn", "__pycache__", ".venv", "venv",
+            ".cache", ".Trash", "*.app", "Library"
+        ]
+    }
+    
+    def __init__(self, include=None, exclude=None, max_size_mb=None, prune_dirs=None):
+        self.config = {
+            "include": self.DEFAULTS["include"] if include is None else include,
+            "exclude": self.DEFAULTS["exclude"] if exclude is None else exclude,
+            "max_size_mb": self.DEFAULTS["max_size_mb"] if max_size_mb is None else max_size_mb,
+            "prune_dirs": self.DEFAULTS["prune_dirs"] if prune_dirs is None else prune_dirs
+        }
+        self.include = self.compile(self.config["include"])
+        self.exclude = self.compile(self.config["exclude"])
+        self.prune = self.compile(self.config["prune_dirs"])
+        self.max_size = self.config["max_size_mb"] * 1024 * 1024 if self.config["max_size_mb"] else None
+        self.fingerprint = json.dumps(self.config, sort_keys=True)
+        
+    @classmethod
+    def load(cls, rules_file):
+        """Load rules from a JSON file, falling back to the defaults"""
+        if not Path(rules_file).exists():
+            return cls()
+        try:
+            with open(rules_file, 'r') as f:
+                rules = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"File rules unreadable, using defaults: {rules_file}: {e}")
+            return cls()
+        if not isinstance(rules, dict):
+            print(f"File rules must be a JSON object, using defaults: {rules_file}")
+            return cls()
+        unknown = sorted(set(rules) - set(cls.DEFAULTS))
+        if unknown:
+            print(f"Ignoring unknown file rules in {rules_file}: {', '.join(unknown)}")
+        return cls(**{key: value for key, value in rules.items() if key in cls.DEFAULTS})
+        
+    def compile(self, patterns):
+        """Combine glob patterns into one case-insensitive regex"""
+        if not patterns:
+            return None
+        return re.compile("|".join(fnmatch.translate(pattern.lower()) for pattern in patterns))
+        
+    def prune_dir(self, name):
+        """Check whether a directory subtree should never be entered"""
+        return bool(self.prune and self.prune.match(name.lower()))
+        
+    def accepts(self, name, size):
+        """Check whether a file should be organized"""
+        name = name.lower()
+        if self.include and not self.include.match(name):
+            return False
+        if self.exclude and self.exclude.match(name):
+            return False
+        return self.max_size is None or size <= self.max_size
+        
 
 class CaseAutomation:
-    def __init__(self, base_path="/Users/owner/GitHub/SYNC"):
+    def __init__(self, base_path="/Users/owner/GitHub/SYNC", rules=None):
         self.base_path = Path(base_path)
         self.case_folder = self.base_path / "amazon-q-case"
+        self.checkpoint_file = self.case_folder / "scan_checkpoint.json"
+        self.timeline_index_file = self.case_folder / "event_log_index.json"
+        self.case_files = None
         self.setup_folders()
+        self.rules = rules or FileRules.load(self.case_folder / "organize_rules.json")
+        self.scan_checkpoint = self.load_scan_checkpoint()
         
     def setup_folders(self):
         """Create organized folder structure"""
@@ -43,15 +120,102 @@ class CaseAutomation:
         for folder in folders:
             (self.case_folder / folder).mkdir(parents=True, exist_ok=True)
             
+    def load_scan_checkpoint(self):
+        """Load the record of files and directories seen by earlier runs"""
+        checkpoint = {"rules": self.rules.fingerprint, "dirs": {}, "files": {}}
+        
+        if self.checkpoint_file.exists():
+            try:
+                with open(self.checkpoint_file, 'r') as f:
+                    checkpoint = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Scan checkpoint unreadable, rescanning: {e}")
+                
+        # Directories pruned by old rules must be listed again; seen files stay seen
+        if checkpoint.get("rules") != self.rules.fingerprint:
+            checkpoint["rules"] = self.rules.fingerprint
+            checkpoint["dirs"] = {}
+            
+        return checkpoint
+        
+    def save_scan_checkpoint(self):
+        """Persist the scan checkpoint"""
+        temp_file = self.checkpoint_file.with_suffix('.tmp')
+        with open(temp_file, 'w') as f:
+            json.dump(self.scan_checkpoint, f)
+        os.replace(temp_file, self.checkpoint_file)
+        
+    def scan_changed_files(self, directory):
+        """Yield files that are new or changed since the last checkpoint"""
+        dirs = self.scan_checkpoint["dirs"]
+        files = self.scan_checkpoint["files"]
+        
+        try:
+            dir_mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            return
+            
+        cached = dirs.get(directory)
+        if cached and cached["mtime_ns"] == dir_mtime:
+            # No entries added or removed here: only subdirectories can hold new files
+            for name in cached["subdirs"]:
+                yield from self.scan_changed_files(os.path.join(directory, name))
+            return
+            
+        subdirs = []
+        dir_names = set()
+        file_names = []
+        try:
+            with os.scandir(directory) as entries:
+                entries = list(entries)
+        except OSError:
+            return
+            
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                dir_names.add(entry.name)
+                if self.rules.prune_dir(entry.name):
+                    continue
+                subdirs.append(entry.name)
+                yield from self.scan_changed_files(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                file_names.append(entry.name)
+                stat = entry.stat(follow_symlinks=False)
+                if not self.rules.accepts(entry.name, stat.st_size):
+                    continue
+                signature = [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+                if files.get(entry.path) != signature:
+                    yield Path(entry.path)
+                    # Only reached once the caller has processed the file
+                    files[entry.path] = signature
+                    
+        # Forget files that were removed from this directory
+        if cached:
+            for name in set(cached["files"]) - set(file_names):
+                files.pop(os.path.join(directory, name), None)
+            # ...and everything under subdirectories that are gone
+            for name in set(cached["subdirs"]) - dir_names:
+                self.forget_scan_subtree(os.path.join(directory, name))
+                
+        dirs[directory] = {"mtime_ns": dir_mtime, "subdirs": subdirs, "files": file_names}
+        
+    def forget_scan_subtree(self, directory):
+        """Drop checkpoint entries for a removed directory and everything below it"""
+        prefix = directory + os.sep
+        for section in (self.scan_checkpoint["dirs"], self.scan_checkpoint["files"]):
+            for key in [key for key in section if key == directory or key.startswith(prefix)]:
+                del section[key]
+                
     def auto_organize_files(self, source_folder):
-        """Automatically organize files based on naming patterns"""
+        """Automatically organize new or changed files based on naming patterns"""
         source = Path(source_folder)
         if not source.exists():
             return
             
-        for file_path in source.rglob("*"):
-            if file_path.is_file():
-                self.categorize_file(file_path)
+        for file_path in self.scan_changed_files(str(source)):
+            self.categorize_file(file_path)
+            
+        self.save_scan_checkpoint()
                 
     def categorize_file(self, file_path):
         """Categorize file based on name and content patterns"""
@@ -85,52 +249,161 @@ class CaseAutomation:
         new_name = f"{timestamp}_{file_path.name}"
         shutil.copy2(file_path, dest / new_name)
         
+    def walk_case_folder(self):
+        """Collect every entry under the case folder in a single scandir pass"""
+        entries = []
+        stack = [(str(self.case_folder), "")]
+        
+        while stack:
+            directory, rel_dir = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        record = {
+                            'name': entry.name,
+                            'path': entry.path,
+                            'rel_dir': rel_dir,
+                            'top': rel_dir.split('/')[0] if rel_dir else entry.name,
+                            'category': os.path.basename(directory),
+                            'is_dir': is_dir,
+                            'size': 0,
+                            'mtime': 0
+                        }
+                        if is_dir:
+                            stack.append((entry.path, f"{rel_dir}/{entry.name}" if rel_dir else entry.name))
+                        else:
+                            stat = entry.stat(follow_symlinks=False)
+                            record['size'] = stat.st_size
+                            record['mtime'] = stat.st_mtime
+                        entries.append(record)
+            except OSError as e:
+                print(f"Scan failed for {directory}: {e}")
+                
+        return entries
+        
+    def get_case_files(self):
+        """Return the shared case folder walk, scanning once per run"""
+        if self.case_files is None:
+            self.case_files = self.walk_case_folder()
+        return self.case_files
+        
+    def record_case_file(self, file_path):
+        """Add a report written during this run to the shared walk"""
+        if self.case_files is None:
+            return
+        if any(entry['path'] == str(file_path) for entry in self.case_files):
+            return
+            
+        rel_dir = file_path.parent.relative_to(self.case_folder).as_posix()
+        stat = file_path.stat()
+        self.case_files.append({
+            'name': file_path.name,
+            'path': str(file_path),
+            'rel_dir': rel_dir,
+            'top': rel_dir.split('/')[0],
+            'category': file_path.parent.name,
+            'is_dir': False,
+            'size': stat.st_size,
+            'mtime': stat.st_mtime
+        })
+        
+    def under(self, entry, rel_dir):
+        """Check whether a walk entry lies inside a case subfolder"""
+        return entry['rel_dir'] == rel_dir or entry['rel_dir'].startswith(rel_dir + '/')
+        
+    def load_timeline_index(self, timeline_doc):
+        """Load the sidecar index of rows already written to Event_Log.md"""
+        try:
+            with open(self.timeline_index_file, 'r') as f:
+                index = json.load(f)
+            # Any outside edit to the log invalidates the recorded offsets
+            if timeline_doc.stat().st_size == index["size"]:
+                return index
+        except (OSError, ValueError, KeyError):
+            pass
+        return None
+        
     def generate_timeline_log(self):
-        """Generate chronological timeline from organized files"""
-        timeline = []
-        
-        # Scan all folders for files
-        for folder in self.case_folder.rglob("*"):
-            if folder.is_file():
-                # Extract date from filename
-                date_match = re.search(r'(\d{8})', folder.name)
-                if date_match:
-                    date_str = date_match.group(1)
-                    date_obj = datetime.datetime.strptime(date_str, "%Y%m%d")
-                    
-                    timeline.append({
-                        'date': date_obj.strftime("%Y-%m-%d"),
-                        'file': folder.name,
-                        'category': folder.parent.name,
-                        'path': str(folder)
-                    })
-                    
-        # Sort by date
-        timeline.sort(key=lambda x: x['date'])
+        """Generate chronological timeline from organized files, rewriting only the changed tail"""
+        timeline_doc = self.case_folder / "04_Timeline/Event_Log.md"
+        index = self.load_timeline_index(timeline_doc)
+        rows = index["rows"] if index else []
+        emitted = {row[3]: position for position, row in enumerate(rows)}
+        
+        seen = set()
+        new_events = []
+        
+        # Only files not already in the log need their date parsed
+        for entry in self.get_case_files():
+            if entry['is_dir']:
+                continue
+            if entry['path'] in emitted:
+                seen.add(entry['path'])
+                continue
+                
+            # Extract date from filename
+            date_match = re.search(r'(\d{8})', entry['name'])
+            if date_match:
+                date_str = date_match.group(1)
+                date_obj = datetime.datetime.strptime(date_str, "%Y%m%d")
+                new_events.append([date_obj.strftime("%Y-%m-%d"), entry['name'], entry['category'], entry['path']])
+                
+        removed = [position for path, position in emitted.items() if path not in seen]
+        
+        # Rows before the first insertion or removal keep their bytes and offsets
+        first_changed = len(rows)
+        if removed:
+            first_changed = min(removed)
+        if new_events:
+            keys = [(row[0], row[3]) for row in rows]
+            earliest = min((event[0], event[3]) for event in new_events)
+            first_changed = min(first_changed, bisect.bisect_left(keys, earliest))
+            
+        if index and first_changed == len(rows) and not new_events:
+            return
+            
+        removed = set(removed)
+        tail = [row[:4] for position, row in enumerate(rows) if position >= first_changed and position not in removed]
+        tail.extend(new_events)
+        tail.sort(key=lambda x: (x[0], x[3]))
         
         # Generate timeline document
-        timeline_doc = self.case_folder / "04_Timeline/Event_Log.md"
-        with open(timeline_doc, 'w') as f:
-            f.write("# Amazon Q Case Timeline\n\n")
-            f.write("| Date | Event | Category | File |\n")
-            f.write("|------|-------|----------|------|\n")
+        with open(timeline_doc, 'r+b' if index else 'wb') as f:
+            if index:
+                offset = rows[first_changed][4] if first_changed < len(rows) else index["size"]
+                f.seek(offset)
+                f.truncate()
+            else:
+                f.write(b"# Amazon Q Case Timeline\n\n")
+                f.write(b"| Date | Event | Category | File |\n")
+                f.write(b"|------|-------|----------|------|\n")
+                offset = f.tell()
+                
+            rows = rows[:first_changed]
+            for event in tail:
+                line = f"| {event[0]} | {event[1]} | {event[2]} | {event[3]} |\n".encode('utf-8')
+                f.write(line)
+                rows.append(event + [offset])
+                offset += len(line)
+                
+        with open(self.timeline_index_file, 'w') as f:
+            json.dump({"size": offset, "rows": rows}, f)
             
-            for event in timeline:
-                f.write(f"| {event['date']} | {event['file']} | {event['category']} | {event['path']} |\n")
+        self.record_case_file(timeline_doc)
                 
     def generate_evidence_index(self):
         """Create searchable index of all evidence"""
         evidence_index = []
         
-        evidence_folder = self.case_folder / "02_Evidence"
-        for file_path in evidence_folder.rglob("*"):
-            if file_path.is_file():
+        for entry in self.get_case_files():
+            if not entry['is_dir'] and self.under(entry, "02_Evidence"):
                 evidence_index.append({
-                    'filename': file_path.name,
-                    'category': file_path.parent.name,
-                    'size': file_path.stat().st_size,
-                    'modified': datetime.datetime.fromtimestamp(file_path.stat().st_mtime).strftime("%Y-%m-%d"),
-                    'path': str(file_path)
+                    'filename': entry['name'],
+                    'category': entry['category'],
+                    'size': entry['size'],
+                    'modified': datetime.datetime.fromtimestamp(entry['mtime']).strftime("%Y-%m-%d"),
+                    'path': entry['path']
                 })
                 
         # Save as JSON for web interface
@@ -138,6 +411,8 @@ class CaseAutomation:
         with open(index_file, 'w') as f:
             json.dump(evidence_index, f, indent=2)
             
+        self.record_case_file(index_file)
+            
     def generate_case_summary(self):
         """AI-generated case summary"""
         summary = {
@@ -161,32 +436,33 @@ class CaseAutomation:
     def get_folder_stats(self):
         """Get statistics for each folder"""
         stats = {}
-        for folder in self.case_folder.iterdir():
-            if folder.is_dir():
-                file_count = len(list(folder.rglob("*")))
-                stats[folder.name] = file_count
+        for entry in self.get_case_files():
+            if not entry['rel_dir'] and entry['is_dir']:
+                stats.setdefault(entry['name'], 0)
+            elif entry['rel_dir']:
+                stats[entry['top']] = stats.get(entry['top'], 0) + 1
         return stats
         
     def identify_key_documents(self):
         """Identify most important documents"""
         key_docs = []
+        case_files = self.get_case_files()
         
         # Look for ESA documents
-        for file_path in self.case_folder.rglob("*esa*"):
-            if file_path.is_file():
+        for entry in case_files:
+            if not entry['is_dir'] and 'esa' in entry['name']:
                 key_docs.append({
                     'type': 'ESA Document',
-                    'file': file_path.name,
+                    'file': entry['name'],
                     'importance': 'high'
                 })
                 
         # Look for HR correspondence
-        hr_folder = self.case_folder / "02_Evidence/HR_Responses"
-        for file_path in hr_folder.rglob("*"):
-            if file_path.is_file():
+        for entry in case_files:
+            if not entry['is_dir'] and self.under(entry, "02_Evidence/HR_Responses"):
                 key_docs.append({
                     'type': 'HR Response',
-                    'file': file_path.name,
+                    'file': entry['name'],
                     'importance': 'high'
                 })
                 
@@ -194,8 +470,7 @@ class CaseAutomation:
         
     def count_timeline_events(self):
         """Count events in timeline"""
-        timeline_folder = self.case_folder / "04_Timeline"
-        return len(list(timeline_folder.rglob("*")))
+        return sum(1 for entry in self.get_case_files() if self.under(entry, "04_Timeline"))
         
     def run_daily_automation(self):
         """Run daily automation tasks"""
@@ -212,7 +487,8 @@ class CaseAutomation:
             if location.exists():
                 self.auto_organize_files(location)
                 
-        # Generate reports
+        # Generate reports from one walk of the case folder
+        self.case_files = self.walk_case_folder()
         self.generate_timeline_log()
         self.generate_evidence_index()
         self.generate_case_summary()
@@ -0,0 +1,128 @@
+"""
+Cold Storage
+Archive files compressed by enhanced-automation.py after they go idle. The
+case manager, the form identification system and the reports share one codec
+table, one index of compressed files, and openers that read a file whether
+or not it has been compressed
+"""
+
+import datetime
+import gzip
+import json
+import lzma
+import os
+import time
+from pathlib import Path
+
+# Codec name -> (file suffix, opener)
+COLD_STORAGE_CODECS = {
+    "gzip": (".gz", gzip.open),
+    "lzma": (".xz", lzma.open)
+}
+
+# File suffix -> opener, for compressed files met while walking a directory
+COMPRESSED_OPENERS = {suffix: opener for suffix, opener in COLD_STORAGE_CODECS.values()}
+
+def is_compressed(path):
+    return Path(path).suffix.lower() in COMPRESSED_OPENERS
+
+def original_suffix(path):
+    """Suffix a file had before compression (".txt" for "notes.txt.gz")"""
+    path = Path(path)
+    return Path(path.stem).suffix if is_compressed(path) else path.suffix
+
+def open_stored_file(path, mode='rb'):
+    """Open a file as found on disk, decompressing it when it has a cold storage suffix"""
+    opener = COMPRESSED_OPENERS.get(Path(path).suffix.lower(), open)
+    if 'b' in mode:
+        return opener(path, mode)
+    # gzip and lzma default to binary, so text reads need an explicit 't'
+    if opener is not open and 't' not in mode:
+        mode += 't'
+    return opener(path, mode, encoding='utf-8', errors='ignore')
+
+class ColdStorage:
+    def __init__(self, case_folder):
+        self.index_file = Path(case_folder) / "cold_storage_index.json"
+        # Timed reads made through this instance, for the decompression cost report
+        self.read_stats = []
+
+    def load_index(self):
+        """Load the original path -> compressed file index"""
+        if self.index_file.exists():
+            with open(self.index_file, 'r') as f:
+                return json.load(f)
+        return {"items": {}}
+
+    def save_index(self, index):
+        temp_file = self.index_file.with_suffix('.tmp')
+        with open(temp_file, 'w') as f:
+            json.dump(index, f, indent=2)
+        os.replace(temp_file, self.index_file)
+
+    def record(self, index, original_path, compressed_path, codec, original_size, compressed_size):
+        """Add one compressed file to the index and save it"""
+        index["items"][str(original_path)] = {
+            "compressed_path": str(compressed_path),
+            "codec": codec,
+            "original_size": original_size,
+            "compressed_size": compressed_size,
+            "compressed_date": datetime.datetime.now().isoformat()
+        }
+        self.save_index(index)
+
+    def resolve(self, path, index=None):
+        """Where an archived file's content is now: the file itself, or its compressed copy"""
+        path = Path(path)
+        if path.exists():
+            return path
+        item = (index or self.load_index())["items"].get(str(path))
+        return Path(item["compressed_path"]) if item else path
+
+    def open(self, path, mode='rb'):
+        """Open an archived file by its original path, compressed or not"""
+        return open_stored_file(self.resolve(path), mode)
+
+    def stream_stored(self, path, chunk_size=65536):
+        """Yield a stored file's content in chunks, timing the read"""
+        start = time.perf_counter()
+        total_bytes = 0
+        with open_stored_file(path) as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                total_bytes += len(chunk)
+                yield chunk
+
+        self.read_stats.append({
+            "path": str(path),
+            "compressed": is_compressed(path),
+            "bytes": total_bytes,
+            "seconds": time.perf_counter() - start
+        })
+
+    def stream(self, path, chunk_size=65536):
+        """Yield an archived file's content by its original path"""
+        yield from self.stream_stored(self.resolve(path), chunk_size)
+
+    def read(self, path):
+        return b"".join(self.stream(path))
+
+    def report(self, index=None):
+        """Space saved by cold storage and decompression cost per read"""
+        index = index or self.load_index()
+        items = index["items"].values()
+        original_bytes = sum(item["original_size"] for item in items)
+        compressed_bytes = sum(item["compressed_size"] for item in items)
+
+        compressed_reads = [read for read in self.read_stats if read["compressed"]]
+        read_seconds = sum(read["seconds"] for read in compressed_reads)
+        read_bytes = sum(read["bytes"] for read in compressed_reads)
+
+        return {
+            "compressed_files": len(index["items"]),
+            "original_bytes": original_bytes,
+            "compressed_bytes": compressed_bytes,
+            "bytes_saved": original_bytes - compressed_bytes,
+            "compressed_reads": len(compressed_reads),
+            "avg_decompress_seconds": read_seconds / len(compressed_reads) if compressed_reads else 0.0,
+            "decompress_mb_per_second": read_bytes / read_seconds / 1e6 if read_seconds else 0.0
+        }
@@ -6,17 +6,36 @@ Comprehensive file processing, evidence analysis, and integration
 
 import os
 import json
+import fcntl
+import hashlib
 import datetime
 import shutil
 from pathlib import Path
 import re
+import time
+from cold_storage import COLD_STORAGE_CODECS, ColdStorage, is_compressed
+
+# Archived-file metadata records buffered before a segment flush
+METADATA_BATCH_SIZE = 500
 
 class EnhancedCaseManager:
-    def __init__(self, base_path="/Users/owner/GitHub/SYNC"):
+    def __init__(self, base_path="/Users/owner/GitHub/SYNC", cold_storage_days=None):
         self.base_path = Path(base_path)
         self.case_folder = self.base_path / "case-management"
         self.archive_folder = self.case_folder / "archive"
+        # Archive files idle this many days are compressed by a complete run; None leaves them alone
+        self.cold_storage_days = cold_storage_days
+        self.cold_storage = ColdStorage(self.case_folder)
+        self.aggregates_file = self.case_folder / "evidence_aggregates.json"
+        self.journal_file = self.case_folder / "run_journal.jsonl"
+        self.journal = None
+        self.journal_handle = None
+        self.metadata_segment = self.case_folder / "metadata_segment.jsonl"
+        self.metadata_index_file = self.case_folder / "metadata_index.json"
+        self.metadata_index = None
+        self.metadata_batch = []
         self.setup_enhanced_structure()
+        self.evidence_aggregates = self.load_evidence_aggregates()
         
     def setup_enhanced_structure(self):
         """Create comprehensive folder structure"""
@@ -67,6 +86,7 @@ class EnhancedCaseManager:
                     processed = self.process_source_folder(source)
                     total_processed += processed
                     
+            self.flush_metadata()
             self.log("ARCHIVE", f"Processed {total_processed} files")
             return total_processed
             
@@ -81,10 +101,26 @@ class EnhancedCaseManager:
             
             for file_path in source_folder.rglob("*"):
                 if file_path.is_file() and not file_path.name.startswith('.'):
+                    # Files archived before an interrupted run are not copied again
+                    file_key = self.journal_file_key(file_path)
+                    if self.journal and file_key in self.journal["files"]:
+                        processed_count += 1
+                        continue
+                        
                     category = self.smart_categorize_file(file_path)
                     if self.archive_file(file_path, category):
+                        # Journaled as soon as the copy exists, with its still-buffered
+                        # metadata, so a crash before the batch flush neither copies the
+                        # file again nor loses its record
+                        metadata = self.metadata_batch[-1] if self.metadata_batch else None
+                        if metadata and metadata["original_path"] != str(file_path):
+                            metadata = None
+                        self.append_journal({"type": "file", "key": file_key, "metadata": metadata})
                         processed_count += 1
                         
+                    if len(self.metadata_batch) >= METADATA_BATCH_SIZE:
+                        self.flush_metadata()
+                        
             return processed_count
             
         except Exception as e:
@@ -142,10 +178,11 @@ class EnhancedCaseManager:
             dest_path = dest_folder / dest_name
             
             # Copy file
+            source_stat = source_path.stat()
             shutil.copy2(source_path, dest_path)
             
             # Create metadata
-            self.create_file_metadata(source_path, dest_path, category)
+            self.create_file_metadata(source_path, dest_path, category, source_stat)
             
             self.log("ARCHIVED", f"{source_path.name} -> {category}")
             return True
@@ -154,29 +191,209 @@ class EnhancedCaseManager:
             self.log("ERROR", f"Archive failed for {source_path}: {str(e)}")
             return False
             
-    def create_file_metadata(self, source_path, dest_path, category):
+    def create_file_metadata(self, source_path, dest_path, category, source_stat=None):
         """Create comprehensive metadata for archived files"""
         try:
+            # copy2 preserves size and mtime, so one stat of the source is enough
+            source_stat = source_stat or source_path.stat()
+            
             metadata = {
                 "original_path": str(source_path),
                 "archived_path": str(dest_path),
                 "category": category,
-                "file_size": dest_path.stat().st_size,
+                "file_size": source_stat.st_size,
                 "archived_date": datetime.datetime.now().isoformat(),
-                "original_modified": datetime.datetime.fromtimestamp(source_path.stat().st_mtime).isoformat(),
+                "original_modified": datetime.datetime.fromtimestamp(source_stat.st_mtime).isoformat(),
                 "file_type": dest_path.suffix.lower(),
                 "relevance_score": self.calculate_relevance_score(dest_path, category),
                 "keywords": self.extract_keywords(dest_path),
                 "case_priority": self.assess_case_priority(dest_path, category)
             }
             
-            metadata_file = dest_path.with_suffix('.json')
-            with open(metadata_file, 'w') as f:
-                json.dump(metadata, f, indent=2)
+            # Buffer the record; the running totals are persisted with each flush
+            self.metadata_batch.append(metadata)
+            self.add_to_evidence_aggregates(metadata)
                 
         except Exception as e:
             self.log("ERROR", f"Metadata creation failed: {str(e)}")
             
+    def load_metadata_index(self):
+        """Load the archived_path -> (offset, length) index of the metadata segment"""
+        if self.metadata_index is None:
+            self.metadata_index = self.read_metadata_index()
+        return self.metadata_index
+        
+    def read_metadata_index(self):
+        """Read the metadata index as other processes last left it"""
+        if not self.metadata_index_file.exists():
+            return {}
+        with open(self.metadata_index_file, 'r') as f:
+            return json.load(f)
+            
+    def refresh_shared_state(self):
+        """Drop the cached index and aggregates so archives made by other processes show up"""
+        self.metadata_index = None
+        self.evidence_aggregates = self.load_evidence_aggregates()
+        
+    def flush_metadata(self):
+        """Append buffered metadata to the segment and persist its index
+        
+        The segment stays locked until the index and aggregates are replaced, and
+        both are re-read under the lock, so a daemon and a cron run archiving at
+        the same time never overwrite each other's entries.
+        """
+        try:
+            if not self.metadata_batch:
+                return
+                
+            with open(self.metadata_segment, 'a+b') as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                index = self.read_metadata_index()
+                offset = f.seek(0, os.SEEK_END)
+                
+                # Terminate a line torn by an earlier crash before appending
+                if offset:
+                    f.seek(offset - 1)
+                    if f.read(1) != b"\n":
+                        f.write(b"\n")
+                        offset += 1
+                        
+                for metadata in self.metadata_batch:
+                    line = (json.dumps(metadata) + "\n").encode('utf-8')
+                    f.write(line)
+                    index[metadata['archived_path']] = [offset, len(line)]
+                    offset += len(line)
+                    
+                f.flush()
+                os.fsync(f.fileno())
+                
+                temp_file = self.metadata_index_file.with_suffix('.tmp')
+                with open(temp_file, 'w') as index_f:
+                    json.dump(index, index_f)
+                os.replace(temp_file, self.metadata_index_file)
+                self.metadata_index = index
+                
+                # Count this batch on top of the totals other processes saved
+                self.evidence_aggregates = self.read_evidence_aggregates()
+                if self.evidence_aggregates is None:
+                    # Rebuilt from the segment, which already holds this batch
+                    self.rebuild_evidence_aggregates()
+                else:
+                    for metadata in self.metadata_batch:
+                        self.add_to_evidence_aggregates(metadata)
+                    self.save_evidence_aggregates()
+                
+            self.metadata_batch = []
+            
+        except Exception as e:
+            self.log("ERROR", f"Metadata flush failed: {str(e)}")
+            
+    def get_file_metadata(self, archived_path):
+        """Look up one archived file's metadata"""
+        entry = self.load_metadata_index().get(str(archived_path))
+        if entry:
+            offset, length = entry
+            with open(self.metadata_segment, 'rb') as f:
+                f.seek(offset)
+                return json.loads(f.read(length))
+                
+        # Files archived before batching have a JSON file next to them
+        legacy_file = Path(archived_path).with_suffix('.json')
+        if legacy_file.exists():
+            with open(legacy_file, 'r') as f:
+                return json.load(f)
+        return None
+        
+    def iter_file_metadata(self):
+        """Yield metadata for every archived file, from the segment and legacy JSON files"""
+        for metadata_file in self.archive_folder.rglob("*.json"):
+            try:
+                with open(metadata_file, 'r') as f:
+                    metadata = json.load(f)
+                if isinstance(metadata, dict) and 'archived_path' in metadata:
+                    yield metadata
+            except Exception as e:
+                self.log("ERROR", f"Metadata read failed for {metadata_file}: {str(e)}")
+                
+        if not self.metadata_segment.exists():
+            return
+            
+        index = self.load_metadata_index()
+        with open(self.metadata_segment, 'rb') as f:
+            offset = 0
+            for line in f:
+                try:
+                    metadata = json.loads(line)
+                    # Lines never indexed belong to a batch lost in a crash
+                    if index.get(metadata['archived_path'], [None])[0] == offset:
+                        yield metadata
+                except Exception as e:
+                    self.log("ERROR", f"Metadata segment read failed at offset {offset}: {str(e)}")
+                offset += len(line)
+                
+    def empty_evidence_aggregates(self):
+        """Return zeroed evidence aggregates"""
+        return {
+            "updated": None,
+            "total_files": 0,
+            "categories": {},
+            "priorities": {}
+        }
+        
+    def add_to_evidence_aggregates(self, metadata):
+        """Count one archived item in the running aggregates"""
+        aggregates = self.evidence_aggregates
+        category = metadata['category']
+        priority = metadata.get('case_priority', 'medium')
+        
+        aggregates["total_files"] += 1
+        aggregates["categories"][category] = aggregates["categories"].get(category, 0) + 1
+        aggregates["priorities"][priority] = aggregates["priorities"].get(priority, 0) + 1
+        aggregates["updated"] = datetime.datetime.now().isoformat()
+        
+    def load_evidence_aggregates(self):
+        """Load persisted aggregates, rebuilding them from metadata if missing"""
+        aggregates = self.read_evidence_aggregates()
+        if aggregates is not None:
+            return aggregates
+        return self.rebuild_evidence_aggregates()
+        
+    def read_evidence_aggregates(self):
+        """Persisted aggregates, or None when missing or unreadable"""
+        try:
+            if self.aggregates_file.exists():
+                with open(self.aggregates_file, 'r') as f:
+                    return json.load(f)
+        except Exception as e:
+            self.log("ERROR", f"Aggregates load failed: {str(e)}")
+        return None
+        
+    def rebuild_evidence_aggregates(self):
+        """Recount aggregates from every metadata file in the archive"""
+        self.evidence_aggregates = self.empty_evidence_aggregates()
+        
+        for metadata in self.iter_file_metadata():
+            try:
+                self.add_to_evidence_aggregates(metadata)
+            except Exception as e:
+                self.log("ERROR", f"Aggregate rebuild failed for {metadata.get('archived_path')}: {str(e)}")
+                
+        self.save_evidence_aggregates()
+        return self.evidence_aggregates
+        
+    def save_evidence_aggregates(self):
+        """Persist the running evidence aggregates"""
+        temp_file = self.aggregates_file.with_suffix('.tmp')
+        with open(temp_file, 'w') as f:
+            json.dump(self.evidence_aggregates, f, indent=2)
+        os.replace(temp_file, self.aggregates_file)
+        
+    def calculate_case_strength(self):
+        """Case strength score from the running aggregates"""
+        total_files = self.evidence_aggregates["total_files"]
+        high_priority = self.evidence_aggregates["priorities"].get("high", 0)
+        return min(100, (total_files * 5) + (high_priority * 15))
+        
     def calculate_relevance_score(self, file_path, category):
         """Calculate relevance score for case"""
         try:
@@ -247,12 +464,10 @@ class EnhancedCaseManager:
         """Generate enhanced timeline from all archived files"""
         try:
             timeline_events = []
+            cold_index = self.cold_storage.load_index()
             
-            for metadata_file in self.archive_folder.rglob("*.json"):
+            for metadata in self.iter_file_metadata():
                 try:
-                    with open(metadata_file, 'r') as f:
-                        metadata = json.load(f)
-                        
                     event = {
                         "date": metadata.get('original_modified', metadata.get('archived_date')),
                         "title": Path(metadata['original_path']).name,
@@ -260,13 +475,15 @@ class EnhancedCaseManager:
                         "priority": metadata.get('case_priority', 'medium'),
                         "relevance_score": metadata.get('relevance_score', 50),
                         "keywords": metadata.get('keywords', []),
-                        "file_path": metadata['archived_path']
+                        "file_path": metadata['archived_path'],
+                        # Where the content is now, if cold storage compressed it
+                        "stored_path": str(self.cold_storage.resolve(metadata['archived_path'], cold_index))
                     }
                     
                     timeline_events.append(event)
                     
                 except Exception as e:
-                    self.log("ERROR", f"Timeline processing failed for {metadata_file}: {str(e)}")
+                    self.log("ERROR", f"Timeline processing failed for {metadata.get('archived_path')}: {str(e)}")
                     
             # Sort by date
             timeline_events.sort(key=lambda x: x['date'])
@@ -295,12 +512,10 @@ class EnhancedCaseManager:
                 "high_priority": [],
                 "evidence_summary": {}
             }
+            cold_index = self.cold_storage.load_index()
             
-            for metadata_file in self.archive_folder.rglob("*.json"):
+            for metadata in self.iter_file_metadata():
                 try:
-                    with open(metadata_file, 'r') as f:
-                        metadata = json.load(f)
-                        
                     category = metadata['category']
                     if category not in evidence_db["categories"]:
                         evidence_db["categories"][category] = []
@@ -308,6 +523,7 @@ class EnhancedCaseManager:
                     evidence_item = {
                         "filename": Path(metadata['original_path']).name,
                         "archived_path": metadata['archived_path'],
+                        "stored_path": str(self.cold_storage.resolve(metadata['archived_path'], cold_index)),
                         "relevance_score": metadata.get('relevance_score', 50),
                         "priority": metadata.get('case_priority', 'medium'),
                         "keywords": metadata.get('keywords', []),
@@ -323,6 +539,19 @@ class EnhancedCaseManager:
                 except Exception as e:
                     self.log("ERROR", f"Evidence DB processing failed: {str(e)}")
                     
+            # Reconcile running aggregates with the full scan
+            self.evidence_aggregates = {
+                "updated": evidence_db["generated"],
+                "total_files": evidence_db["total_files"],
+                "categories": {cat: len(items) for cat, items in evidence_db["categories"].items()},
+                "priorities": {}
+            }
+            for items in evidence_db["categories"].values():
+                for item in items:
+                    priorities = self.evidence_aggregates["priorities"]
+                    priorities[item["priority"]] = priorities.get(item["priority"], 0) + 1
+            self.save_evidence_aggregates()
+                    
             # Generate summary statistics
             evidence_db["evidence_summary"] = {
                 "total_categories": len(evidence_db["categories"]),
@@ -357,55 +586,51 @@ class EnhancedCaseManager:
                 "next_actions": []
             }
             
-            # Load evidence database for analysis
-            db_file = self.archive_folder / "reports/evidence_summaries/evidence_database.json"
-            if db_file.exists():
-                with open(db_file, 'r') as f:
-                    evidence_db = json.load(f)
-                    
-                # Analyze case strength
-                total_files = evidence_db.get('total_files', 0)
-                high_priority = len(evidence_db.get('high_priority', []))
-                
-                case_strength = min(100, (total_files * 5) + (high_priority * 15))
-                
-                analysis["analysis_summary"] = {
-                    "case_strength_score": case_strength,
-                    "total_evidence_files": total_files,
-                    "high_priority_evidence": high_priority,
-                    "evidence_categories": len(evidence_db.get('categories', {}))
-                }
-                
-                # Generate strengths
-                if high_priority >= 3:
-                    analysis["strengths"].append("Strong high-priority evidence collection")
-                if 'evidence/esa_documents' in evidence_db.get('categories', {}):
-                    analysis["strengths"].append("ESA documentation present")
-                if 'evidence/hr_responses' in evidence_db.get('categories', {}):
-                    analysis["strengths"].append("HR correspondence documented")
-                    
-                # Generate risks
-                if total_files < 5:
-                    analysis["risks"].append("Limited evidence collection")
-                if high_priority < 2:
-                    analysis["risks"].append("Insufficient high-priority documentation")
-                    
-                # Generate recommendations
-                analysis["recommendations"] = [
-                    "Continue documenting all HR interactions",
-                    "Maintain chronological timeline of events",
-                    "Ensure ESA documentation is current and complete",
-                    "Document sole caregiver responsibilities thoroughly"
-                ]
+            # Running aggregates replace a reload of the evidence database
+            aggregates = self.evidence_aggregates
+            categories = aggregates["categories"]
+            total_files = aggregates["total_files"]
+            high_priority = aggregates["priorities"].get("high", 0)
+            
+            case_strength = self.calculate_case_strength()
+            
+            analysis["analysis_summary"] = {
+                "case_strength_score": case_strength,
+                "total_evidence_files": total_files,
+                "high_priority_evidence": high_priority,
+                "evidence_categories": len(categories)
+            }
+            
+            # Generate strengths
+            if high_priority >= 3:
+                analysis["strengths"].append("Strong high-priority evidence collection")
+            if 'evidence/esa_documents' in categories:
+                analysis["strengths"].append("ESA documentation present")
+            if 'evidence/hr_responses' in categories:
+                analysis["strengths"].append("HR correspondence documented")
                 
-                # Generate next actions
-                analysis["next_actions"] = [
-                    "Review and organize high-priority evidence",
-                    "Follow up on pending HR requests",
-                    "Update case timeline with recent events",
-                    "Prepare comprehensive evidence summary"
-                ]
+            # Generate risks
+            if total_files < 5:
+                analysis["risks"].append("Limited evidence collection")
+            if high_priority < 2:
+                analysis["risks"].append("Insufficient high-priority documentation")
                 
+            # Generate recommendations
+            analysis["recommendations"] = [
+                "Continue documenting all HR interactions",
+                "Maintain chronological timeline of events",
+                "Ensure ESA documentation is current and complete",
+                "Document sole caregiver responsibilities thoroughly"
+            ]
+            
+            # Generate next actions
+            analysis["next_actions"] = [
+                "Review and organize high-priority evidence",
+                "Follow up on pending HR requests",
+                "Update case timeline with recent events",
+                "Prepare comprehensive evidence summary"
+            ]
+            
             # Save analysis report
             report_file = self.archive_folder / "reports/case_analysis/comprehensive_analysis.json"
             report_file.parent.mkdir(parents=True, exist_ok=True)
@@ -478,14 +703,142 @@ class EnhancedCaseManager:
             web_data_file = self.case_folder / "archived_case_data.json"
             with open(web_data_file, 'w') as f:
                 json.dump(web_data, f, indent=2)
-                
+
+            # Save sharded copy so the web UI can load only what it shows
+            self.write_web_shards(web_data)
+
             self.log("SYNC", "Web interface data synchronized")
             return True
-            
+
         except Exception as e:
             self.log("ERROR", f"Web sync failed: {str(e)}")
             return False
-            
+
+    def write_web_shards(self, web_data):
+        """Write manifest plus per-month timeline and per-category evidence shards"""
+        try:
+            shard_dir = self.case_folder / "archived_case_data"
+            (shard_dir / "timeline").mkdir(parents=True, exist_ok=True)
+            (shard_dir / "evidence").mkdir(parents=True, exist_ok=True)
+
+            # Group timeline by month and evidence by category
+            timeline_groups = {}
+            for event in web_data["timeline"]:
+                timeline_groups.setdefault(event['date'][:7], []).append(event)
+
+            evidence_groups = {}
+            for item in web_data["evidence"]:
+                evidence_groups.setdefault(item['type'], []).append(item)
+
+            manifest = {
+                "generated": datetime.datetime.now().isoformat(),
+                "strategy": web_data["strategy"],
+                "correspondence": web_data["correspondence"],
+                "timeline": self.write_shard_group(shard_dir, "timeline", timeline_groups, 'date'),
+                "evidence": self.write_shard_group(shard_dir, "evidence", evidence_groups, 'dateAdded')
+            }
+
+            # Manifest goes last so the UI never sees shards it can't load
+            manifest_file = shard_dir / "manifest.json"
+            temp_file = manifest_file.with_suffix('.tmp')
+            with open(temp_file, 'w') as f:
+                json.dump(manifest, f, indent=2)
+            os.replace(temp_file, manifest_file)
+
+            self.log("SYNC", f"Web shards written: {len(timeline_groups)} months, {len(evidence_groups)} categories")
+            return manifest
+
+        except Exception as e:
+            self.log("ERROR", f"Web shard export failed: {str(e)}")
+            return {}
+
+    def write_shard_group(self, shard_dir, section, groups, date_field):
+        """Write one shard file per group and return its manifest section"""
+        shards = []
+        written = set()
+
+        for key in sorted(groups):
+            items = sorted(groups[key], key=lambda x: x[date_field])
+            file_name = f"{re.sub(r'[^A-Za-z0-9_-]', '_', key)}.json"
+            data = json.dumps(items, indent=2)
+            with open(shard_dir / section / file_name, 'w') as f:
+                f.write(data)
+            written.add(file_name)
+
+            shards.append({
+                "key": key,
+                "file": f"{section}/{file_name}",
+                # Changes whenever the shard's content does, so the UI knows to refetch it
+                "version": hashlib.blake2b(data.encode('utf-8'), digest_size=8).hexdigest(),
+                "count": len(items),
+                "start": items[0][date_field],
+                "end": items[-1][date_field]
+            })
+
+        # Drop shards for months or categories that no longer exist
+        for stale in (shard_dir / section).glob("*.json"):
+            if stale.name not in written:
+                stale.unlink()
+
+        return {
+            "total": sum(shard["count"] for shard in shards),
+            "start": min((shard["start"] for shard in shards), default=None),
+            "end": max((shard["end"] for shard in shards), default=None),
+            "shards": shards
+        }
+
+    def compress_cold_files(self, days=30, codec="gzip"):
+        """Compress archived files that haven't been accessed for `days` days"""
+        try:
+            suffix, opener = COLD_STORAGE_CODECS[codec]
+            index = self.cold_storage.load_index()
+            cutoff = time.time() - days * 86400
+            compressed_count = 0
+
+            for file_path in self.archive_folder.rglob("*"):
+                # Metadata, reports and already-compressed files stay as they are
+                if (not file_path.is_file() or file_path.suffix.lower() == '.json'
+                        or is_compressed(file_path)
+                        or 'reports' in file_path.relative_to(self.archive_folder).parts):
+                    continue
+
+                stat = file_path.stat()
+                if max(stat.st_atime, stat.st_mtime) > cutoff:
+                    continue
+
+                compressed_path = file_path.with_name(file_path.name + suffix)
+                try:
+                    with open(file_path, 'rb') as src, opener(compressed_path, 'wb') as dst:
+                        shutil.copyfileobj(src, dst)
+                    shutil.copystat(file_path, compressed_path)
+
+                    compressed_size = compressed_path.stat().st_size
+                    if compressed_size >= stat.st_size:
+                        # Already-compressed formats (jpg, png, pdf) gain nothing
+                        compressed_path.unlink()
+                        continue
+
+                    # Read it back before the original goes; this also times decompression
+                    if sum(len(chunk) for chunk in self.cold_storage.stream_stored(compressed_path)) != stat.st_size:
+                        raise ValueError("compressed copy does not read back to the original size")
+                except Exception as e:
+                    compressed_path.unlink(missing_ok=True)
+                    self.log("ERROR", f"Cold storage compression failed for {file_path}: {str(e)}")
+                    continue
+
+                # The entry is saved before the original goes, so a crash leaves both copies, never neither
+                self.cold_storage.record(index, file_path, compressed_path, codec, stat.st_size, compressed_size)
+                file_path.unlink()
+                compressed_count += 1
+
+            report = self.cold_storage.report(index)
+            self.log("COLD_STORAGE", f"Compressed {compressed_count} files, {report['bytes_saved']} bytes saved in total")
+            return report
+
+        except Exception as e:
+            self.log("ERROR", f"Cold storage compression failed: {str(e)}")
+            return {}
+
     def log(self, action, message):
         """Enhanced logging with error handling"""
         try:
@@ -501,46 +854,137 @@ class EnhancedCaseManager:
         except Exception as e:
             print(f"Logging failed: {str(e)}")
             
+    def open_run_journal(self):
+        """Load the journal of an interrupted run, or start a new one"""
+        journal = {"stages": {}, "files": set()}
+        journaled_metadata = []
+        
+        if self.journal_file.exists():
+            with open(self.journal_file, 'r') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # A torn last line from a crash is simply redone
+                        continue
+                    if record["type"] == "stage":
+                        journal["stages"][record["stage"]] = record["result"]
+                    elif record["type"] == "file":
+                        journal["files"].add(record["key"])
+                        if record.get("metadata"):
+                            journaled_metadata.append(record["metadata"])
+                        
+            self.log("RESUME", f"Resuming run: {len(journal['stages'])} stages, {len(journal['files'])} files already done")
+            
+        self.journal = journal
+        self.journal_handle = open(self.journal_file, 'a')
+        
+        # Metadata of files copied after the last batch flush is only in the journal
+        index = self.read_metadata_index()
+        unflushed = [metadata for metadata in journaled_metadata if metadata["archived_path"] not in index]
+        if unflushed:
+            self.metadata_batch.extend(unflushed)
+            self.flush_metadata()
+            self.log("RESUME", f"Recovered metadata for {len(unflushed)} archived files")
+        return journal
+        
+    def append_journal(self, record, sync=False):
+        """Append one durable record to the run journal"""
+        if not self.journal:
+            return
+        self.journal_handle.write(json.dumps(record) + "\n")
+        self.journal_handle.flush()
+        if sync:
+            os.fsync(self.journal_handle.fileno())
+            
+    def close_run_journal(self, completed):
+        """Close the run journal, removing it once the run has finished"""
+        if not self.journal:
+            return
+        self.journal_handle.close()
+        self.journal = None
+        self.journal_handle = None
+        if completed:
+            self.journal_file.unlink()
+            
+    def journal_file_key(self, file_path):
+        """Identify a source file version for the run journal"""
+        stat = file_path.stat()
+        return f"{file_path}|{stat.st_size}|{stat.st_mtime_ns}"
+        
+    def run_stage(self, stage, func):
+        """Run one automation stage unless the journal shows it already completed"""
+        if stage in self.journal["stages"]:
+            print(f"⏭️  {stage} already completed, skipping")
+            return self.journal["stages"][stage]
+            
+        result = func()
+        self.journal["stages"][stage] = result
+        self.append_journal({"type": "stage", "stage": stage, "result": result}, sync=True)
+        return result
+        
     def run_complete_automation(self):
         """Run all automation processes"""
         try:
             print("🚀 Starting Enhanced Case Management Automation...")
+            self.open_run_journal()
             
             # Step 1: Archive all existing files
             print("📁 Archiving existing files...")
-            archived_count = self.archive_all_existing_files()
+            archived_count = self.run_stage("archive", self.archive_all_existing_files)
             
             # Step 2: Generate timeline
             print("📅 Generating comprehensive timeline...")
-            timeline = self.generate_comprehensive_timeline()
+            timeline_count = self.run_stage("timeline", lambda: len(self.generate_comprehensive_timeline()))
             
             # Step 3: Create evidence database
             print("📊 Creating evidence database...")
-            evidence_db = self.generate_evidence_database()
+            evidence_count = self.run_stage("evidence_db", lambda: self.generate_evidence_database().get('total_files', 0))
             
             # Step 4: Generate case analysis
             print("🎯 Generating case analysis...")
-            analysis = self.generate_case_analysis_report()
+            case_strength = self.run_stage("analysis", lambda: self.generate_case_analysis_report().get('analysis_summary', {}).get('case_strength_score', 0))
             
             # Step 5: Sync with web interface
             print("🌐 Syncing with web interface...")
-            sync_success = self.sync_with_web_interface()
+            sync_success = self.run_stage("sync", self.sync_with_web_interface)
+            
+            # Step 6: Compress cold archive files (opt-in)
+            cold_report = None
+            if self.cold_storage_days is not None:
+                print("🧊 Compressing cold archive files...")
+                cold_report = self.run_stage("cold_storage", lambda: self.compress_cold_files(self.cold_storage_days))
+            
+            self.close_run_journal(completed=True)
             
             # Final summary
             print("\n✅ AUTOMATION COMPLETE!")
             print(f"📁 Archived Files: {archived_count}")
-            print(f"📅 Timeline Events: {len(timeline)}")
-            print(f"📊 Evidence Items: {evidence_db.get('total_files', 0)}")
-            print(f"🎯 Case Strength: {analysis.get('analysis_summary', {}).get('case_strength_score', 0)}%")
+            print(f"📅 Timeline Events: {timeline_count}")
+            print(f"📊 Evidence Items: {evidence_count}")
+            print(f"🎯 Case Strength: {case_strength}%")
             print(f"🌐 Web Sync: {'Success' if sync_success else 'Failed'}")
+            if cold_report:
+                print(f"🧊 Cold Storage: {cold_report['compressed_files']} files, "
+                      f"{cold_report['bytes_saved']} bytes saved "
+                      f"({cold_report['original_bytes']} → {cold_report['compressed_bytes']})")
+                if cold_report['compressed_reads']:
+                    print(f"🧊 Decompression: {cold_report['avg_decompress_seconds'] * 1000:.1f} ms per file, "
+                          f"{cold_report['decompress_mb_per_second']:.1f} MB/s")
             print(f"📂 Archive Location: {self.archive_folder}")
             
             return True
             
         except Exception as e:
             self.log("ERROR", f"Complete automation failed: {str(e)}")
+            self.close_run_journal(completed=False)
             return False
 
 if __name__ == "__main__":
-    manager = EnhancedCaseManager()
+    import sys
+    # --cold-storage DAYS also compresses archive files idle for DAYS days
+    cold_storage_days = None
+    if "--cold-storage" in sys.argv:
+        cold_storage_days = int(sys.argv[sys.argv.index("--cold-storage") + 1])
+    manager = EnhancedCaseManager(cold_storage_days=cold_storage_days)
     manager.run_complete_automation()
\ No newline at end of file
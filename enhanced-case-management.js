@@ -11,6 +11,17 @@ let caseData = {
     }
 };
 
+// Sharded archive export written by enhanced-automation.py
+const ARCHIVE_INITIAL_MONTHS = 3;
+let archivedManifest = null;
+// "section:file" -> manifest version of the shard last merged; a new version is fetched again
+const loadedArchivedShards = new Map();
+// Evidence shards are only fetched once the evidence tab has been opened
+let archivedEvidenceRequested = false;
+
+// Earliest date shown on the timeline (YYYY-MM-DD); empty shows everything loaded
+let timelineFromDate = '';
+
 // Enhanced initialization
 document.addEventListener('DOMContentLoaded', function() {
     try {
@@ -29,34 +40,130 @@ document.addEventListener('DOMContentLoaded', function() {
 // Load archived data from Python automation
 async function loadArchivedData() {
     try {
-        const response = await fetch('./archived_case_data.json');
-        if (response.ok) {
-            const archivedData = await response.json();
-            
-            // Merge archived data with existing data
-            if (archivedData.timeline) {
-                caseData.archived.timeline = archivedData.timeline;
-                caseData.timeline = [...caseData.timeline, ...archivedData.timeline];
-            }
-            
-            if (archivedData.evidence) {
-                caseData.archived.evidence = archivedData.evidence;
-                caseData.evidence = [...caseData.evidence, ...archivedData.evidence];
-            }
-            
-            if (archivedData.strategy) {
-                caseData.archived.analysis = archivedData.strategy;
-            }
-            
-            console.log('Archived data loaded successfully');
-            showSuccessMessage('Archived case data integrated successfully');
+        const response = await fetch('./archived_case_data/manifest.json');
+        if (!response.ok) {
+            return loadArchivedDataFile();
+        }
+        
+        archivedManifest = await response.json();
+        
+        const fromInput = document.getElementById('timeline-from');
+        if (fromInput && archivedManifest.timeline.start) {
+            fromInput.min = archivedManifest.timeline.start.slice(0, 10);
+        }
+        
+        if (archivedManifest.strategy) {
+            caseData.archived.analysis = archivedManifest.strategy;
         }
+        
+        // First paint only needs the most recent months of the timeline; on later
+        // syncs, months loaded since are refreshed too if their shard changed
+        const timelineShards = archivedManifest.timeline.shards.filter((shard, i, shards) =>
+            i >= shards.length - ARCHIVE_INITIAL_MONTHS || loadedArchivedShards.has(`timeline:${shard.file}`)
+        );
+        await Promise.all(timelineShards.map(shard => loadArchivedShard('timeline', shard)));
+        
+        if (archivedEvidenceRequested) {
+            await loadArchivedEvidence();
+        }
+        
+        // Older months load when the timeline is filtered back to them
+        if (timelineFromDate) {
+            await loadArchivedTimelineRange(timelineFromDate, '9999-12-31');
+        }
+        
+        renderAllSections();
+        console.log(`Archived data loaded: ${caseData.archived.timeline.length}/${archivedManifest.timeline.total} timeline events`);
+        showSuccessMessage('Archived case data integrated successfully');
     } catch (error) {
         console.error('Failed to load archived data:', error);
         // Continue without archived data
     }
 }
 
+// Load archived timeline shards overlapping a date range (YYYY-MM-DD)
+async function loadArchivedTimelineRange(startDate, endDate) {
+    if (!archivedManifest) return;
+    
+    const shards = archivedManifest.timeline.shards.filter(shard =>
+        shard.end >= startDate && shard.start <= endDate
+    );
+    await Promise.all(shards.map(shard => loadArchivedShard('timeline', shard)));
+    renderTimeline();
+}
+
+// Load every evidence category shard (first opened from the evidence tab)
+async function loadArchivedEvidence() {
+    archivedEvidenceRequested = true;
+    if (!archivedManifest) return;
+    
+    await Promise.all(archivedManifest.evidence.shards.map(shard => loadArchivedShard('evidence', shard)));
+    renderEvidence();
+}
+
+// Timeline date filter: show events from startDate on, loading their archive shards
+async function filterTimelineFrom(startDate) {
+    try {
+        timelineFromDate = startDate;
+        renderTimeline();
+        if (startDate) {
+            await loadArchivedTimelineRange(startDate, '9999-12-31');
+        }
+    } catch (error) {
+        console.error('Timeline filter failed:', error);
+        showErrorMessage('Failed to load archived timeline events');
+    }
+}
+
+// Fetch one shard from the manifest and merge its items, unless this version is already merged
+async function loadArchivedShard(section, shard) {
+    const shardKey = `${section}:${shard.file}`;
+    // Manifests written before shard versions fall back to count and last date
+    const version = shard.version || `${shard.count}:${shard.end}`;
+    if (loadedArchivedShards.get(shardKey) === version) return;
+    
+    // The version in the URL keeps the browser from answering with a cached copy
+    const response = await fetch(`./archived_case_data/${shard.file}?v=${encodeURIComponent(version)}`);
+    if (!response.ok) return;
+    
+    const items = await response.json();
+    loadedArchivedShards.set(shardKey, version);
+    mergeArchivedItems(section, items);
+}
+
+// Merge archived items into case data, replacing earlier copies with the same id
+function mergeArchivedItems(section, items) {
+    const incomingIds = new Set(items.map(item => item.id));
+    const replaced = new Set(caseData.archived[section].filter(item => incomingIds.has(item.id)));
+    
+    caseData.archived[section] = [...caseData.archived[section].filter(item => !replaced.has(item)), ...items];
+    caseData[section] = [...caseData[section].filter(item => !replaced.has(item)), ...items];
+}
+
+// Fallback for exports written before the sharded format
+async function loadArchivedDataFile() {
+    const response = await fetch('./archived_case_data.json');
+    if (response.ok) {
+        const archivedData = await response.json();
+        
+        if (archivedData.timeline) {
+            mergeArchivedItems('timeline', archivedData.timeline);
+        }
+        
+        if (archivedData.evidence) {
+            mergeArchivedItems('evidence', archivedData.evidence);
+        }
+        
+        if (archivedData.strategy) {
+            caseData.archived.analysis = archivedData.strategy;
+        }
+        
+        renderAllSections();
+        console.log('Archived data loaded successfully');
+        showSuccessMessage('Archived case data integrated successfully');
+    }
+}
+
 // Enhanced timeline rendering with archived data
 function renderTimeline() {
     try {
@@ -66,7 +173,9 @@ function renderTimeline() {
         container.innerHTML = '';
         
         // Sort all timeline events by date
-        const allEvents = [...caseData.timeline].sort((a, b) => new Date(a.date) - new Date(b.date));
+        const allEvents = [...caseData.timeline]
+            .filter(event => !timelineFromDate || String(event.date).slice(0, 10) >= timelineFromDate)
+            .sort((a, b) => new Date(a.date) - new Date(b.date));
         
         allEvents.forEach(event => {
             const eventDiv = document.createElement('div');
@@ -397,9 +506,7 @@ function startAutoSync() {
         
         // Check for new archived data every 5 minutes
         setInterval(() => {
-            loadArchivedData().then(() => {
-                renderAllSections();
-            });
+            loadArchivedData();
         }, 300000);
         
         console.log('Auto-sync started');
@@ -416,11 +523,13 @@ function updateTimelineStats() {
             const total = caseData.timeline.length;
             const archived = caseData.timeline.filter(e => e.type === 'archived').length;
             const manual = total - archived;
+            // Older archived months stay unloaded until the date filter reaches them
+            const archivedTotal = archivedManifest ? archivedManifest.timeline.total : archived;
             
             statsElement.innerHTML = `
                 <div class="stats-item">Total Events: ${total}</div>
                 <div class="stats-item">Manual: ${manual}</div>
-                <div class="stats-item">Archived: ${archived}</div>
+                <div class="stats-item">Archived: ${archived}${archivedTotal > archived ? ` of ${archivedTotal}` : ''}</div>
             `;
         }
     } catch (error) {
@@ -435,11 +544,13 @@ function updateEvidenceStats() {
             const total = caseData.evidence.length;
             const highPriority = caseData.evidence.filter(e => e.relevance === 'high').length;
             const archived = caseData.evidence.filter(e => e.id && typeof e.id === 'number' && e.id < 0).length;
+            // Archived evidence stays unloaded until the evidence tab is opened
+            const archivedTotal = archivedManifest ? archivedManifest.evidence.total : archived;
             
             statsElement.innerHTML = `
                 <div class="stats-item">Total Evidence: ${total}</div>
                 <div class="stats-item">High Priority: ${highPriority}</div>
-                <div class="stats-item">Archived: ${archived}</div>
+                <div class="stats-item">Archived: ${archived}${archivedTotal > archived ? ` of ${archivedTotal}` : ''}</div>
             `;
         }
     } catch (error) {
@@ -537,6 +648,17 @@ function initializeEnhancedFeatures() {
         // Initialize keyboard shortcuts
         initializeKeyboardShortcuts();
         
+        // Archived evidence loads the first time its tab is opened
+        const evidenceTab = document.querySelector('.tab-btn[data-tab="evidence"]');
+        if (evidenceTab) {
+            evidenceTab.addEventListener('click', () => {
+                loadArchivedEvidence().catch(error => {
+                    console.error('Failed to load archived evidence:', error);
+                    showErrorMessage('Failed to load archived evidence');
+                });
+            });
+        }
+        
         console.log('Enhanced features initialized');
     } catch (error) {
         console.error('Enhanced features initialization failed:', error);
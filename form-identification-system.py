@@ -9,6 +9,8 @@ import re
 import hashlib
 from pathlib import Path
 from datetime import datetime
+from form_classifier import CLASSIFIER
+from cold_storage import open_stored_file, original_suffix
 
 class FormIdentificationSystem:
     def __init__(self):
@@ -16,89 +18,9 @@ class FormIdentificationSystem:
         self.forms_dir = self.base_path / "ontario-forms"
         self.archive_dir = self.base_path / "archive"
         
-        # Enhanced form identification patterns
-        self.form_signatures = {
-            "Form_14A_Affidavit": {
-                "patterns": [r"FORM 14A", r"AFFIDAVIT.*GENERAL", r"MAKE OATH AND SAY"],
-                "keywords": ["affidavit", "sworn", "affirmed", "oath"],
-                "priority": 9
-            },
-            "Form_14_Application": {
-                "patterns": [r"FORM 14", r"APPLICATION.*GENERAL", r"COURT CASE HAS BEEN STARTED"],
-                "keywords": ["application", "court case", "respondent"],
-                "priority": 10
-            },
-            "Form_14B_Motion": {
-                "patterns": [r"FORM 14B", r"MOTION", r"WILL MAKE A MOTION"],
-                "keywords": ["motion", "grounds", "relief sought"],
-                "priority": 9
-            },
-            "Form_8_Financial": {
-                "patterns": [r"FORM 8", r"FINANCIAL STATEMENT", r"INCOME", r"EXPENSES"],
-                "keywords": ["income", "expenses", "assets", "debts"],
-                "priority": 8
-            },
-            "Form_35_1_Support": {
-                "patterns": [r"FORM 35.1", r"AFFIDAVIT.*SUPPORT.*CLAIM", r"CUSTODY OR ACCESS"],
-                "keywords": ["custody", "access", "best interests"],
-                "priority": 9
-            },
-            "Form_6B_Record": {
-                "patterns": [r"FORM 6B", r"CONTINUING RECORD", r"TABLE OF CONTENTS"],
-                "keywords": ["continuing record", "table of contents", "tab"],
-                "priority": 7
-            },
-            "Emergency_Motion_Request": {
-                "patterns": [r"EMERGENCY MOTION", r"URGENT", r"IMMEDIATE RELIEF"],
-                "keywords": ["emergency", "urgent", "immediate", "risk"],
-                "priority": 10
-            },
-            "Supreme_Court_Application": {
-                "patterns": [r"SUPREME COURT", r"LEAVE TO APPEAL", r"COURT OF APPEAL"],
-                "keywords": ["supreme court", "leave", "appeal", "national importance"],
-                "priority": 8
-            },
-            "FACS_Complaint": {
-                "patterns": [r"FAMILY.*CHILDREN.*SERVICES", r"FACS", r"COMPLAINT.*CONCERN"],
-                "keywords": ["family services", "children services", "complaint"],
-                "priority": 7
-            },
-            "Police_Report_Ontario": {
-                "patterns": [r"ONTARIO POLICE", r"INCIDENT REPORT", r"OCCURRENCE"],
-                "keywords": ["police", "incident", "report", "occurrence"],
-                "priority": 8
-            },
-            "Police_Complaint_Niagara": {
-                "patterns": [r"NIAGARA.*POLICE", r"PUBLIC COMPLAINT", r"PROFESSIONAL STANDARDS"],
-                "keywords": ["niagara police", "complaint", "professional standards"],
-                "priority": 8
-            },
-            "Police_Report_Peel": {
-                "patterns": [r"PEEL.*POLICE", r"OCCURRENCE REPORT", r"COMPLAINANT"],
-                "keywords": ["peel police", "occurrence", "complainant"],
-                "priority": 8
-            },
-            "ESA_Documentation": {
-                "patterns": [r"EMOTIONAL SUPPORT", r"ESA", r"ACCOMMODATION"],
-                "keywords": ["emotional support", "ESA", "accommodation", "disability"],
-                "priority": 9
-            },
-            "HR_Correspondence": {
-                "patterns": [r"HUMAN RESOURCES", r"HR", r"ACCOMMODATION REQUEST"],
-                "keywords": ["human resources", "HR", "accommodation", "workplace"],
-                "priority": 8
-            },
-            "Medical_Records": {
-                "patterns": [r"MEDICAL", r"DOCTOR", r"PHYSICIAN", r"DIAGNOSIS"],
-                "keywords": ["medical", "doctor", "physician", "diagnosis", "treatment"],
-                "priority": 7
-            },
-            "Legal_Correspondence": {
-                "patterns": [r"LEGAL", r"LAWYER", r"COUNSEL", r"SOLICITOR"],
-                "keywords": ["legal", "lawyer", "counsel", "solicitor", "attorney"],
-                "priority": 8
-            }
-        }
+        # Shared, precompiled form identification rules
+        self.classifier = CLASSIFIER
+        self.form_signatures = CLASSIFIER.signatures
     
     def calculate_file_hash(self, file_path):
         """Calculate SHA-256 hash of file"""
@@ -110,47 +32,7 @@ class FormIdentificationSystem:
     
     def identify_document_type(self, content, filename=""):
         """Identify document type with confidence scoring"""
-        results = []
-        content_lower = content.lower()
-        filename_lower = filename.lower()
-        
-        for doc_type, signature in self.form_signatures.items():
-            confidence = 0
-            matches = []
-            
-            # Pattern matching
-            for pattern in signature["patterns"]:
-                if re.search(pattern, content, re.IGNORECASE):
-                    confidence += 25
-                    matches.append(f"Pattern: {pattern}")
-            
-            # Keyword matching
-            keyword_matches = 0
-            for keyword in signature["keywords"]:
-                if keyword in content_lower:
-                    keyword_matches += 1
-                    confidence += 10
-                    matches.append(f"Keyword: {keyword}")
-            
-            # Filename matching
-            if any(keyword in filename_lower for keyword in signature["keywords"]):
-                confidence += 15
-                matches.append("Filename match")
-            
-            # Priority weighting
-            confidence = confidence * (signature["priority"] / 10)
-            
-            if confidence > 20:  # Minimum threshold
-                results.append({
-                    "document_type": doc_type,
-                    "confidence": min(confidence, 100),
-                    "matches": matches,
-                    "priority": signature["priority"]
-                })
-        
-        # Sort by confidence
-        results.sort(key=lambda x: x["confidence"], reverse=True)
-        return results
+        return self.classifier.identify_document_type(content, filename)
     
     def extract_case_metadata(self, content):
         """Extract comprehensive case metadata"""
@@ -264,16 +146,12 @@ class FormIdentificationSystem:
         processed_files = []
         
         for file_path in directory.rglob("*"):
-            if file_path.is_file() and file_path.suffix.lower() in ['.txt', '.md', '.rtf', '.doc', '.docx']:
+            # Cold-storage files are classified by their original suffix
+            if file_path.is_file() and original_suffix(file_path).lower() in ['.txt', '.md', '.rtf', '.doc', '.docx']:
                 try:
-                    # Read file content
-                    if file_path.suffix.lower() == '.txt':
-                        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                            content = f.read()
-                    else:
-                        # For other formats, try to read as text
-                        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                            content = f.read()
+                    # Read file content (other formats are read as text too)
+                    with open_stored_file(file_path, 'rt') as f:
+                        content = f.read()
                     
                     # Analyze document
                     doc_types = self.identify_document_type(content, file_path.name)
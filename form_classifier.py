@@ -0,0 +1,161 @@
+"""
+Form Classifier
+Shared, precompiled legal form identification rules used by the form
+processor, the identification system and the multi-jurisdiction generator
+"""
+
+import re
+
+# Form signatures: patterns are matched case-insensitively, form numbers use
+# word boundaries so "FORM 14" never matches inside "FORM 14A"
+FORM_SIGNATURES = {
+    "Form_14A_Affidavit": {
+        "patterns": [r"FORM 14A\b", r"AFFIDAVIT.*GENERAL", r"MAKE OATH AND SAY"],
+        "keywords": ["affidavit", "sworn", "affirmed", "oath"],
+        "priority": 9
+    },
+    "Form_14_Application": {
+        "patterns": [r"FORM 14\b", r"APPLICATION.*GENERAL", r"COURT CASE HAS BEEN STARTED"],
+        "keywords": ["application", "court case", "respondent"],
+        "priority": 10
+    },
+    "Form_14B_Motion": {
+        "patterns": [r"FORM 14B\b", r"MOTION", r"WILL MAKE A MOTION"],
+        "keywords": ["motion", "grounds", "relief sought"],
+        "priority": 9
+    },
+    "Form_8_Financial": {
+        "patterns": [r"FORM 8\b", r"FINANCIAL STATEMENT", r"INCOME", r"EXPENSES"],
+        "keywords": ["income", "expenses", "assets", "debts"],
+        "priority": 8
+    },
+    "Form_35_1_Support": {
+        "patterns": [r"FORM 35\.1\b", r"AFFIDAVIT.*SUPPORT.*CLAIM", r"CUSTODY OR ACCESS"],
+        "keywords": ["custody", "access", "best interests"],
+        "priority": 9
+    },
+    "Form_6B_Record": {
+        "patterns": [r"FORM 6B\b", r"CONTINUING RECORD", r"TABLE OF CONTENTS"],
+        "keywords": ["continuing record", "table of contents", "tab"],
+        "priority": 7
+    },
+    "Emergency_Motion_Request": {
+        "patterns": [r"EMERGENCY MOTION", r"URGENT", r"IMMEDIATE RELIEF"],
+        "keywords": ["emergency", "urgent", "immediate", "risk"],
+        "priority": 10
+    },
+    "Supreme_Court_Application": {
+        "patterns": [r"SUPREME COURT", r"LEAVE TO APPEAL", r"COURT OF APPEAL"],
+        "keywords": ["supreme court", "leave", "appeal", "national importance"],
+        "priority": 8
+    },
+    "FACS_Complaint": {
+        "patterns": [r"FAMILY.*CHILDREN.*SERVICES", r"FACS", r"COMPLAINT.*CONCERN"],
+        "keywords": ["family services", "children services", "complaint"],
+        "priority": 7
+    },
+    "Police_Report_Ontario": {
+        "patterns": [r"ONTARIO POLICE", r"INCIDENT REPORT", r"OCCURRENCE"],
+        "keywords": ["police", "incident", "report", "occurrence"],
+        "priority": 8
+    },
+    "Police_Complaint_Niagara": {
+        "patterns": [r"NIAGARA.*POLICE", r"PUBLIC COMPLAINT", r"PROFESSIONAL STANDARDS"],
+        "keywords": ["niagara police", "complaint", "professional standards"],
+        "priority": 8
+    },
+    "Police_Report_Peel": {
+        "patterns": [r"PEEL.*POLICE", r"OCCURRENCE REPORT", r"COMPLAINANT"],
+        "keywords": ["peel police", "occurrence", "complainant"],
+        "priority": 8
+    },
+    "ESA_Documentation": {
+        "patterns": [r"EMOTIONAL SUPPORT", r"ESA", r"ACCOMMODATION"],
+        "keywords": ["emotional support", "ESA", "accommodation", "disability"],
+        "priority": 9
+    },
+    "HR_Correspondence": {
+        "patterns": [r"HUMAN RESOURCES", r"HR", r"ACCOMMODATION REQUEST"],
+        "keywords": ["human resources", "HR", "accommodation", "workplace"],
+        "priority": 8
+    },
+    "Medical_Records": {
+        "patterns": [r"MEDICAL", r"DOCTOR", r"PHYSICIAN", r"DIAGNOSIS"],
+        "keywords": ["medical", "doctor", "physician", "diagnosis", "treatment"],
+        "priority": 7
+    },
+    "Legal_Correspondence": {
+        "patterns": [r"LEGAL", r"LAWYER", r"COUNSEL", r"SOLICITOR"],
+        "keywords": ["legal", "lawyer", "counsel", "solicitor", "attorney"],
+        "priority": 8
+    }
+}
+
+class FormClassifier:
+    def __init__(self, signatures=FORM_SIGNATURES):
+        self.signatures = signatures
+
+        # Compile every pattern once, in declaration order
+        self.rules = [
+            {
+                "document_type": doc_type,
+                "patterns": [(pattern, re.compile(pattern, re.IGNORECASE)) for pattern in signature["patterns"]],
+                "keywords": signature["keywords"],
+                "priority": signature["priority"]
+            }
+            for doc_type, signature in signatures.items()
+        ]
+
+    def identify_document_type(self, content, filename=""):
+        """Identify document types with confidence scoring, most specific first"""
+        results = []
+        content_lower = content.lower()
+        filename_lower = filename.lower()
+
+        for rule in self.rules:
+            confidence = 0
+            matches = []
+            specificity = 0
+
+            # Pattern matching
+            for pattern, compiled in rule["patterns"]:
+                match = compiled.search(content)
+                if match:
+                    confidence += 25
+                    matches.append(f"Pattern: {pattern}")
+                    specificity = max(specificity, len(match.group(0)))
+
+            # Keyword matching
+            for keyword in rule["keywords"]:
+                if keyword in content_lower:
+                    confidence += 10
+                    matches.append(f"Keyword: {keyword}")
+
+            # Filename matching
+            if any(keyword in filename_lower for keyword in rule["keywords"]):
+                confidence += 15
+                matches.append("Filename match")
+
+            # Priority weighting
+            confidence = confidence * (rule["priority"] / 10)
+
+            if confidence > 20:  # Minimum threshold
+                results.append({
+                    "document_type": rule["document_type"],
+                    "confidence": min(confidence, 100),
+                    "matches": matches,
+                    "priority": rule["priority"],
+                    "specificity": specificity
+                })
+
+        # Highest confidence first; ties go to the longest match, then priority
+        results.sort(key=lambda x: (x["confidence"], x["specificity"], x["priority"]), reverse=True)
+        return results
+
+    def identify_form_type(self, content, filename=""):
+        """Return the single best document type, or "Unknown" """
+        results = self.identify_document_type(content, filename)
+        return results[0]["document_type"] if results else "Unknown"
+
+# Shared instance so importers pay the compile cost once per process
+CLASSIFIER = FormClassifier()
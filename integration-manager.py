@@ -11,10 +11,13 @@ import shutil
 from pathlib import Path
 import subprocess
 import time
+from script_loader import load_script
+from large_file_store import LargeFileStore
 
 class IntegrationManager:
-    def __init__(self, base_path="/Users/owner/GitHub/SYNC"):
+    def __init__(self, base_path="/Users/owner/GitHub/SYNC", in_process=False):
         self.base_path = Path(base_path)
+        self.in_process = in_process
         self.case_management = self.base_path / "case-management"
         self.nocode_platform = self.base_path / "no-code-platform"
         self.automation_system = self.base_path / "solecaregiverontario"
@@ -41,7 +44,15 @@ class IntegrationManager:
             
             # Run the enhanced automation script
             automation_script = self.case_management / "enhanced-automation.py"
-            if automation_script.exists():
+            if automation_script.exists() and self.in_process:
+                # Reuse this interpreter instead of starting another python3
+                module = load_script(automation_script)
+                if module.EnhancedCaseManager(str(self.base_path)).run_complete_automation():
+                    self.log("AUTOMATION", "Enhanced automation completed successfully")
+                    return True
+                self.log("AUTOMATION", "Automation failed, see automation.log", "ERROR")
+                return False
+            elif automation_script.exists():
                 result = subprocess.run([
                     "python3", str(automation_script)
                 ], capture_output=True, text=True, cwd=str(self.case_management))
@@ -582,6 +593,10 @@ Logged by: {logged_by}"""
             # Change to case management directory
             os.chdir(str(self.case_management))
             
+            # Large evidence files are committed as pointers by the filter
+            if LargeFileStore(self.case_management).install():
+                self.log("GITHUB", "Installed large file filter")
+                
             # Add all new files
             result = subprocess.run(["git", "add", "."], capture_output=True, text=True)
             if result.returncode != 0:
@@ -0,0 +1,363 @@
+"""
+Large File Store
+Keeps archived screenshots, recordings and PDFs out of git history with a
+clean/smudge filter: whenever git stages a matching file over the size
+threshold (from the automation, auto-sync.js or a plain `git add .`), its
+content goes into a local content store under .git/large-files and git
+records a small pointer instead. The working tree keeps the real file, and
+checkouts turn pointers back into content when the store has it.
+"""
+
+import hashlib
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Files larger than this are committed as pointers
+LARGE_FILE_THRESHOLD = 1024 * 1024
+
+POINTER_HEADER = "case-management large file pointer v1"
+POINTER_MAX_SIZE = 512
+
+FILTER_NAME = "case-lfs"
+
+# Paths routed through the filter; smaller matches are stored by git as usual
+LARGE_FILE_PATTERNS = [
+    "archive/**",
+    "*.pdf", "*.png", "*.jpg", "*.jpeg", "*.gif", "*.heic",
+    "*.mp4", "*.mov", "*.m4a", "*.mp3", "*.wav",
+    "*.doc", "*.docx", "*.zip"
+]
+
+# Largest data payload of one pkt-line in git's long-running filter protocol
+PKT_MAX_DATA = 65516
+
+def find_git_dir(path):
+    """The .git directory of the repository containing path, or None"""
+    path = Path(path).resolve()
+    for directory in [path, *path.parents]:
+        dot_git = directory / ".git"
+        if dot_git.is_dir():
+            return dot_git
+        if dot_git.is_file():
+            # Worktrees and submodules point at their git directory
+            content = dot_git.read_text().strip()
+            if content.startswith("gitdir:"):
+                return (directory / content[len("gitdir:"):].strip()).resolve()
+    return None
+
+class LargeFileStore:
+    def __init__(self, work_tree, threshold=LARGE_FILE_THRESHOLD):
+        self.work_tree = Path(work_tree)
+        self.threshold = threshold
+        git_dir = find_git_dir(self.work_tree)
+        if git_dir is None:
+            raise ValueError(f"{self.work_tree} is not inside a git repository")
+
+        # Inside .git, so the store itself is never staged
+        self.store_dir = git_dir / "large-files"
+        self.objects_dir = self.store_dir / "objects"
+
+    def object_path(self, file_hash):
+        return self.objects_dir / file_hash[:2] / file_hash
+
+    def pointer_text(self, file_hash, size):
+        return f"{POINTER_HEADER}\noid blake2b:{file_hash}\nsize {size}\n"
+
+    def parse_pointer(self, data):
+        """(hash, size) if data is a pointer, else None"""
+        if len(data) > POINTER_MAX_SIZE:
+            return None
+        try:
+            lines = data.decode('utf-8').splitlines()
+        except UnicodeDecodeError:
+            return None
+        if len(lines) != 3 or lines[0] != POINTER_HEADER:
+            return None
+        return lines[1].split(":", 1)[1], int(lines[2].split()[1])
+
+    def install(self):
+        """Register the filter in .git/config and .gitattributes (idempotent)"""
+        # Relative to the top of the work tree, where git runs filters, so the
+        # setting survives a moved checkout or a rebuilt virtualenv
+        top = subprocess.run(["git", "rev-parse", "--show-toplevel"], capture_output=True,
+                             text=True, cwd=self.work_tree, check=True).stdout.strip()
+        script = Path(__file__).resolve()
+        if script.is_relative_to(Path(top).resolve()):
+            script = script.relative_to(Path(top).resolve())
+        command = f"python3 {shlex.quote(str(script))}"
+        settings = {
+            f"filter.{FILTER_NAME}.process": f"{command} filter-process",
+            f"filter.{FILTER_NAME}.clean": f"{command} clean",
+            f"filter.{FILTER_NAME}.smudge": f"{command} smudge"
+        }
+        changed = False
+        for key, value in settings.items():
+            current = subprocess.run(["git", "config", "--local", "--get", key],
+                                     capture_output=True, text=True, cwd=self.work_tree)
+            if current.stdout.strip() != value:
+                subprocess.run(["git", "config", "--local", key, value], cwd=self.work_tree, check=True)
+                changed = True
+
+        attributes_file = self.work_tree / ".gitattributes"
+        existing = attributes_file.read_text().splitlines() if attributes_file.exists() else []
+        missing = self.missing_attributes(existing)
+        if missing:
+            with open(attributes_file, 'a') as f:
+                if existing and existing[-1].strip():
+                    f.write("\n")
+                f.write("# Large evidence files are committed as pointers (large_file_store.py)\n")
+                f.write("\n".join(missing) + "\n")
+            # Files committed before the filter existed are stored as pointers from now on
+            self.renormalize_large_files()
+            changed = True
+
+        return changed
+
+    def missing_attributes(self, existing=None):
+        """.gitattributes lines install() still has to write"""
+        if existing is None:
+            attributes_file = self.work_tree / ".gitattributes"
+            existing = attributes_file.read_text().splitlines() if attributes_file.exists() else []
+        return [f"{pattern} filter={FILTER_NAME}" for pattern in LARGE_FILE_PATTERNS
+                if f"{pattern} filter={FILTER_NAME}" not in existing]
+
+    def renormalize_large_files(self):
+        """Re-stage tracked files over the threshold that the filter patterns now cover"""
+        pathspecs = [f":(glob){pattern}" if "/" in pattern else f":(glob)**/{pattern}"
+                     for pattern in LARGE_FILE_PATTERNS]
+        listed = subprocess.run(["git", "ls-files", "-z", "--", *pathspecs],
+                                capture_output=True, text=True, cwd=self.work_tree)
+
+        # Only files whose stored form changes; deleted and small files are left alone
+        large = []
+        for name in listed.stdout.split("\0"):
+            path = self.work_tree / name
+            if name and path.is_file() and path.stat().st_size > self.threshold:
+                large.append(name)
+        if large:
+            subprocess.run(["git", "add", "--renormalize", "--", *large], cwd=self.work_tree)
+        return large
+
+    def clean(self, source, destination):
+        """Filter content being staged: large content goes to the store, git gets a pointer"""
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        file_hash = hashlib.blake2b()
+        size = 0
+        with tempfile.NamedTemporaryFile(dir=self.store_dir, delete=False) as temp:
+            try:
+                for chunk in iter(lambda: source.read(1024 * 1024), b""):
+                    file_hash.update(chunk)
+                    temp.write(chunk)
+                    size += len(chunk)
+                temp.flush()
+
+                # Small files, and pointers staged as-is, pass through unchanged
+                temp.seek(0)
+                if size <= self.threshold or self.parse_pointer(temp.read(POINTER_MAX_SIZE + 1)):
+                    temp.seek(0)
+                    shutil.copyfileobj(temp, destination)
+                    return
+
+                object_file = self.object_path(file_hash.hexdigest())
+                if not object_file.exists():
+                    object_file.parent.mkdir(parents=True, exist_ok=True)
+                    temp.close()
+                    os.replace(temp.name, object_file)
+                destination.write(self.pointer_text(file_hash.hexdigest(), size).encode('utf-8'))
+            finally:
+                temp.close()
+                if os.path.exists(temp.name):
+                    os.unlink(temp.name)
+
+    def smudge(self, source, destination, pathname=""):
+        """Filter content being checked out: pointers become content when it is stored locally"""
+        head = source.read(POINTER_MAX_SIZE + 1)
+        pointer = self.parse_pointer(head)
+        object_file = self.object_path(pointer[0]) if pointer else None
+
+        if object_file is None or not object_file.exists():
+            if pointer:
+                print(f"⚠️  No local content for {pathname or pointer[0]}; leaving the pointer", file=sys.stderr)
+            destination.write(head)
+            shutil.copyfileobj(source, destination)
+            return
+
+        with open(object_file, 'rb') as f:
+            shutil.copyfileobj(f, destination)
+
+    def hydrate(self, path=None):
+        """Replace pointer files under path (default: the whole work tree) with their content"""
+        root = Path(path) if path else self.work_tree
+
+        hydrated = []
+        missing = []
+        for dir_path, dir_names, file_names in os.walk(root):
+            dir_names[:] = [name for name in dir_names if name != ".git"]
+            for name in file_names:
+                file_path = Path(dir_path) / name
+                try:
+                    if file_path.stat().st_size > POINTER_MAX_SIZE:
+                        continue
+                    pointer = self.parse_pointer(file_path.read_bytes())
+                except OSError:
+                    continue
+                if pointer is None:
+                    continue
+
+                object_file = self.object_path(pointer[0])
+                if not object_file.exists():
+                    missing.append(str(file_path))
+                    continue
+
+                temp_file = file_path.with_name(f".{name}.hydrate")
+                shutil.copyfile(object_file, temp_file)
+                os.replace(temp_file, file_path)
+                hydrated.append(str(file_path))
+
+        print(f"💧 Hydrated {len(hydrated)} large files")
+        if missing:
+            print(f"⚠️  {len(missing)} pointers have no local content: {', '.join(missing[:5])}")
+        return {"hydrated": hydrated, "missing": missing}
+
+class PktLineChannel:
+    """git's pkt-line framing over binary stdin/stdout"""
+
+    FLUSH = None
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    def read_packet(self):
+        header = self.reader.read(4)
+        if len(header) < 4:
+            raise EOFError
+        length = int(header, 16)
+        return self.FLUSH if length == 0 else self.reader.read(length - 4)
+
+    def read_text_list(self):
+        """Text packets up to the next flush, without their newlines"""
+        lines = []
+        while (packet := self.read_packet()) is not self.FLUSH:
+            lines.append(packet.decode('utf-8').rstrip("\n"))
+        return lines
+
+    def write_packet(self, data):
+        self.writer.write(b"%04x" % (len(data) + 4) + data)
+
+    def write_flush(self):
+        self.writer.write(b"0000")
+        self.writer.flush()
+
+    def write_text_list(self, lines):
+        for line in lines:
+            self.write_packet(f"{line}\n".encode('utf-8'))
+        self.write_flush()
+
+class PacketReader:
+    """File-like view of content packets up to the next flush"""
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.buffer = b""
+        self.done = False
+
+    def read(self, size=-1):
+        while not self.done and (size < 0 or len(self.buffer) < size):
+            packet = self.channel.read_packet()
+            if packet is PktLineChannel.FLUSH:
+                self.done = True
+            else:
+                self.buffer += packet
+        if size < 0:
+            size = len(self.buffer)
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+class PacketWriter:
+    """File-like sink that frames written content as packets"""
+
+    def __init__(self, channel):
+        self.channel = channel
+
+    def write(self, data):
+        for start in range(0, len(data), PKT_MAX_DATA):
+            self.channel.write_packet(data[start:start + PKT_MAX_DATA])
+        return len(data)
+
+def run_filter_process(store):
+    """Serve git's long-running filter protocol (filter.<driver>.process)"""
+    channel = PktLineChannel(sys.stdin.buffer, sys.stdout.buffer)
+    if channel.read_text_list()[:2] != ["git-filter-client", "version=2"]:
+        raise ValueError("Unexpected filter protocol handshake")
+    channel.write_text_list(["git-filter-server", "version=2"])
+    channel.read_text_list()
+    channel.write_text_list(["capability=clean", "capability=smudge"])
+
+    while True:
+        try:
+            headers = dict(line.split("=", 1) for line in channel.read_text_list())
+        except EOFError:
+            return
+        content = PacketReader(channel)
+
+        # Content is spooled first: the status has to be sent before any output
+        with tempfile.SpooledTemporaryFile(max_size=LARGE_FILE_THRESHOLD) as output:
+            try:
+                if headers.get("command") == "clean":
+                    store.clean(content, output)
+                elif headers.get("command") == "smudge":
+                    store.smudge(content, output, headers.get("pathname", ""))
+                else:
+                    raise ValueError(f"Unknown filter command: {headers.get('command')}")
+            except Exception as e:
+                print(f"large_file_store: {e}", file=sys.stderr)
+                content.read()
+                channel.write_text_list(["status=error"])
+                continue
+
+            channel.write_text_list(["status=success"])
+            output.seek(0)
+            writer = PacketWriter(channel)
+            for chunk in iter(lambda: output.read(PKT_MAX_DATA), b""):
+                writer.write(chunk)
+            channel.write_flush()
+            # An empty list keeps the status above
+            channel.write_flush()
+
+def main():
+    """Usage: large_file_store.py install | hydrate [path] | clean | smudge | filter-process"""
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+
+    if command in ("clean", "smudge", "filter-process"):
+        # Run by git from the top of the work tree
+        store = LargeFileStore(Path.cwd())
+        if command == "filter-process":
+            run_filter_process(store)
+        elif command == "clean":
+            store.clean(sys.stdin.buffer, sys.stdout.buffer)
+        else:
+            store.smudge(sys.stdin.buffer, sys.stdout.buffer)
+        return True
+
+    if command == "install":
+        path = Path(sys.argv[2]) if len(sys.argv) > 2 else Path.cwd()
+        LargeFileStore(path).install()
+        print(f"✅ Large file filter installed for {path}")
+        return True
+
+    if command == "hydrate":
+        path = Path(sys.argv[2]) if len(sys.argv) > 2 else Path.cwd()
+        store = LargeFileStore(path if path.is_dir() else path.parent)
+        return not store.hydrate(path)["missing"]
+
+    print(main.__doc__)
+    return False
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
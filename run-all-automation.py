@@ -6,100 +6,401 @@ Runs all missing form generation and identification processes
 
 import subprocess
 import sys
+import os
+import io
 import json
+import hashlib
+import threading
+import traceback
+import time
+import collections
+import resource
+import statistics
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
 from datetime import datetime
+from script_loader import load_script
+
+# Seconds before a subprocess step is killed
+SCRIPT_TIMEOUT = 300
+
+# A step regressed if it takes this many times its recent median (and over the floor)
+REGRESSION_FACTOR = 1.5
+REGRESSION_FLOOR_SECONDS = 0.5
+
+# Lines of each stream kept for automation_results.json; the full output is in the step log
+OUTPUT_TAIL_LINES = 200
+
+# Seconds between live progress lines for a running step
+PROGRESS_INTERVAL = 2.0
+
+# Directories never descended into when fingerprinting step inputs
+FINGERPRINT_SKIP_DIRS = {".git", "node_modules", "__pycache__"}
+
+class StepOutput:
+    """Streams one step's output to its log file, keeping only the last lines in memory"""
+    
+    def __init__(self, name, log_path, console, tail_lines=OUTPUT_TAIL_LINES):
+        self.name = name
+        self.log_path = log_path
+        self.console = console
+        self.log = open(log_path, 'w')
+        self.tails = {
+            "stdout": collections.deque(maxlen=tail_lines),
+            "stderr": collections.deque(maxlen=tail_lines)
+        }
+        self.partial = {"stdout": "", "stderr": ""}
+        self.lines = 0
+        self.last_progress = time.monotonic()
+        self.lock = threading.Lock()
+        
+    def write(self, text, stream="stdout"):
+        """Accept any chunk of text; each complete line is logged and kept in the tail"""
+        with self.lock:
+            *lines, self.partial[stream] = (self.partial[stream] + text).split("\n")
+            for line in lines:
+                self.add_line(line, stream)
+                
+    def add_line(self, line, stream):
+        self.log.write(line + "\n" if stream == "stdout" else f"[stderr] {line}\n")
+        self.tails[stream].append(line)
+        self.lines += 1
+        
+        now = time.monotonic()
+        if now - self.last_progress >= PROGRESS_INTERVAL:
+            self.last_progress = now
+            self.console.write(f"   ⋯ {self.name}: {self.lines} lines | {line[:80]}\n")
+            self.console.flush()
+            
+    def close(self):
+        """Flush unterminated lines and return the tails for the results file"""
+        with self.lock:
+            for stream, partial in self.partial.items():
+                if partial:
+                    self.add_line(partial, stream)
+                    self.partial[stream] = ""
+            self.log.close()
+            return {
+                "output": "\n".join(self.tails["stdout"]),
+                "error": "\n".join(self.tails["stderr"]),
+                "output_lines": self.lines
+            }
+
+class ThreadOutputCapture(io.TextIOBase):
+    """sys.stdout/stderr stand-in that routes writes to a per-thread StepOutput"""
+    
+    def __init__(self, stream, stream_name="stdout"):
+        self.stream = stream
+        self.stream_name = stream_name
+        self.local = threading.local()
+        
+    def start(self, sink):
+        self.local.sink = sink
+        
+    def stop(self):
+        self.local.sink = None
+        
+    def write(self, text):
+        sink = getattr(self.local, "sink", None)
+        if sink is None:
+            return self.stream.write(text)
+        sink.write(text, self.stream_name)
+        return len(text)
+        
+    def flush(self):
+        self.stream.flush()
 
 class CompleteAutomationRunner:
-    def __init__(self):
+    def __init__(self, execution_mode="subprocess", force=False):
         self.base_path = Path("/Users/owner/GitHub/SYNC/case-management")
+        self.max_workers = 3
+        self.logs_dir = self.base_path / "automation_logs"
+        self.console = sys.stdout
+        # Steps whose inputs are unchanged and outputs present are skipped unless forced
+        self.force = force
+        self.fingerprints_file = self.base_path / "automation_fingerprints.json"
+        # "subprocess" starts a fresh interpreter per step, "in-process" calls entry points directly
+        self.execution_mode = execution_mode
+        # depends_on lists script names that must finish before a step starts;
+        # entry is the Class.method (or function) called in in-process mode;
+        # inputs/outputs are files or directories relative to base_path (the
+        # script itself is always an input)
         self.scripts = [
             {
                 "name": "Original Ontario Court Forms",
                 "script": "ontario-court-forms.py",
-                "description": "Generate Forms 14, 8, 35.1, 14B, 6B"
+                "description": "Generate Forms 14, 8, 35.1, 14B, 6B",
+                "entry": "OntarioCourtForms.generate_all_forms",
+                "depends_on": [],
+                "inputs": [],
+                "outputs": [
+                    "ontario-forms/Form_14_Application.txt",
+                    "ontario-forms/Form_8_Financial_Statement.txt",
+                    "ontario-forms/Form_35_1_Affidavit_Support.txt",
+                    "ontario-forms/Form_14B_Motion.txt",
+                    "ontario-forms/Form_6B_Continuing_Record.txt",
+                    "ontario-forms/Emergency_Motion_Checklist.txt",
+                    "ontario-forms/forms_summary.json"
+                ]
             },
             {
                 "name": "Multi-Jurisdiction Forms",
                 "script": "multi-jurisdiction-forms.py", 
-                "description": "Generate Form 14A, Emergency Motion, Police Reports, FACS Complaints"
+                "description": "Generate Form 14A, Emergency Motion, Police Reports, FACS Complaints",
+                "entry": "MultiJurisdictionForms.generate_all_missing_forms",
+                "depends_on": [],
+                "inputs": ["form_classifier.py", "automated-form-processor.py"],
+                "outputs": [
+                    "ontario-forms/Form_14A_Affidavit.txt",
+                    "ontario-forms/Emergency_Motion_Request.txt",
+                    "ontario-forms/Supreme_Court_Application.txt",
+                    "ontario-forms/FACS_Niagara_Complaint.txt",
+                    "ontario-forms/Ontario_Police_Report.txt",
+                    "ontario-forms/Niagara_Police_Complaint.txt",
+                    "ontario-forms/Peel_Police_Report.txt",
+                    "ontario-forms/missing_forms_summary.json"
+                ]
             },
             {
                 "name": "Form Identification System",
                 "script": "form-identification-system.py",
-                "description": "AI-powered document identification and analysis"
+                "description": "AI-powered document identification and analysis",
+                "entry": "main",
+                "depends_on": ["Enhanced Automation"],
+                "inputs": [
+                    "form_classifier.py",
+                    "cold_storage.py",
+                    "archive",
+                    "../INGEST",
+                    "../solecaregiverontario/approved"
+                ],
+                "outputs": ["form_identification_report.json"]
             },
             {
                 "name": "Enhanced Automation",
                 "script": "enhanced-automation.py",
-                "description": "File organization and evidence analysis"
+                "description": "File organization and evidence analysis",
+                "entry": "EnhancedCaseManager.run_complete_automation",
+                "depends_on": [],
+                "inputs": [
+                    "cold_storage.py",
+                    "../INGEST",
+                    "../solecaregiverontario/approved",
+                    "../solecaregiverontario/intake",
+                    "../Prompts"
+                ],
+                "outputs": ["archive", "archived_case_data.json", "evidence_aggregates.json"]
             },
             {
                 "name": "Integration Manager",
                 "script": "integration-manager.py",
-                "description": "Cross-system integration and synchronization"
+                "description": "Cross-system integration and synchronization",
+                "entry": "IntegrationManager.run_complete_integration",
+                "entry_kwargs": {"in_process": True},
+                # Re-archives into archive/ and commits the tree, so it waits for every
+                # step that reads archive/ or writes files the commit should include
+                "depends_on": [
+                    "Original Ontario Court Forms",
+                    "Multi-Jurisdiction Forms",
+                    "Form Identification System",
+                    "Enhanced Automation"
+                ],
+                "inputs": [
+                    "enhanced-automation.py",
+                    "archived_case_data.json",
+                    "archive",
+                    "../no-code-platform",
+                    "../solecaregiverontario"
+                ],
+                "outputs": [
+                    "archive",
+                    "archived_case_data.json",
+                    "integration_dashboard.json",
+                    "integration_dashboard.html",
+                    "templates/legal_templates.json"
+                ]
             },
             {
                 "name": "Version Control",
                 "script": "version-control.py",
-                "description": "Git integration and version tracking"
+                "description": "Git integration and version tracking",
+                "entry": "main",
+                "depends_on": [
+                    "Original Ontario Court Forms",
+                    "Multi-Jurisdiction Forms",
+                    "Form Identification System",
+                    "Enhanced Automation",
+                    "Integration Manager"
+                ],
+                "inputs": [
+                    "index.html",
+                    "enhanced-case-management.js",
+                    "enhanced-automation.py",
+                    "integration-manager.py",
+                    "ontario-court-forms.py",
+                    "ontario-forms"
+                ],
+                "outputs": ["versions"]
             }
         ]
         
     def run_script(self, script_info):
-        """Run a single automation script"""
+        """Run a single automation script, streaming its output to a step log"""
+        script_path = self.base_path / script_info["script"]
+        if not script_path.exists():
+            return {
+                "success": False,
+                "error": f"Script not found: {script_info['script']}",
+                "output": ""
+            }
+        
+        print(f"🔄 Running: {script_info['name']}")
+        print(f"   {script_info['description']}")
+        
+        self.logs_dir.mkdir(exist_ok=True)
+        sink = StepOutput(script_info["name"], self.logs_dir / f"{script_path.stem}.log", self.console)
+        result = {}
         try:
-            script_path = self.base_path / script_info["script"]
-            if not script_path.exists():
-                return {
-                    "success": False,
-                    "error": f"Script not found: {script_info['script']}",
-                    "output": ""
-                }
-            
-            print(f"🔄 Running: {script_info['name']}")
-            print(f"   {script_info['description']}")
-            
-            result = subprocess.run(
-                [sys.executable, str(script_path)],
-                cwd=str(self.base_path),
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 minute timeout
-            )
-            
-            if result.returncode == 0:
-                print(f"✅ {script_info['name']} completed successfully")
-                return {
-                    "success": True,
-                    "output": result.stdout,
-                    "error": result.stderr
-                }
+            if self.execution_mode == "in-process":
+                result = self.run_script_in_process(script_info, script_path, sink)
             else:
-                print(f"❌ {script_info['name']} failed with return code {result.returncode}")
-                return {
-                    "success": False,
-                    "output": result.stdout,
-                    "error": result.stderr
+                # Unbuffered so progress arrives as the child prints it
+                process = subprocess.Popen(
+                    [sys.executable, str(script_path)],
+                    cwd=str(self.base_path),
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    text=True,
+                    env={**os.environ, "PYTHONUNBUFFERED": "1"}
+                )
+                usage, timed_out = self.wait_with_usage(process, sink)
+                
+                if timed_out:
+                    raise subprocess.TimeoutExpired(script_path, SCRIPT_TIMEOUT)
+                
+                if process.returncode == 0:
+                    print(f"✅ {script_info['name']} completed successfully")
+                else:
+                    print(f"❌ {script_info['name']} failed with return code {process.returncode}")
+                result = {
+                    "success": process.returncode == 0,
+                    "resources": self.usage_summary(usage)
                 }
                 
         except subprocess.TimeoutExpired:
             print(f"⏰ {script_info['name']} timed out")
-            return {
+            result = {
                 "success": False,
-                "error": "Script execution timed out",
-                "output": ""
+                "error": "Script execution timed out"
             }
         except Exception as e:
             print(f"💥 {script_info['name']} crashed: {e}")
-            return {
+            result = {
                 "success": False,
-                "error": str(e),
-                "output": ""
+                "error": str(e)
             }
+        finally:
+            captured = sink.close()
+        
+        # A runner-side error replaces the captured stderr tail
+        return {
+            **captured,
+            **result,
+            "log_file": str(sink.log_path.relative_to(self.base_path))
+        }
+    
+    def wait_with_usage(self, process, sink):
+        """Stream a child's output into sink and reap it with wait4 to get its own rusage"""
+        def read(name, stream):
+            for line in stream:
+                sink.write(line, name)
+        readers = [
+            threading.Thread(target=read, args=("stdout", process.stdout)),
+            threading.Thread(target=read, args=("stderr", process.stderr))
+        ]
+        for reader in readers:
+            reader.start()
+        
+        timed_out = threading.Event()
+        def kill():
+            timed_out.set()
+            process.kill()
+        timer = threading.Timer(SCRIPT_TIMEOUT, kill)
+        timer.start()
+        
+        # RUSAGE_CHILDREN deltas would mix concurrent steps; wait4 is per child
+        _, status, usage = os.wait4(process.pid, 0)
+        timer.cancel()
+        process.returncode = os.waitstatus_to_exitcode(status)
+        
+        for reader in readers:
+            reader.join()
+        return usage, timed_out.is_set()
+    
+    def usage_summary(self, usage, before=None, scope="child"):
+        """CPU, peak memory and block I/O from a rusage (or the delta since before).
+        
+        scope says whose usage it is: "child" (the step's own process),
+        "thread" (the step's thread) or "process-wide" (the whole runner,
+        including steps running alongside, where threads aren't measured).
+        """
+        def delta(field):
+            return getattr(usage, field) - (getattr(before, field) if before else 0)
+        
+        # ru_maxrss is bytes on macOS, kilobytes on Linux
+        max_rss_kb = usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+        return {
+            "scope": scope,
+            "cpu_user": delta("ru_utime"),
+            "cpu_system": delta("ru_stime"),
+            "max_rss_kb": max_rss_kb,
+            "block_input_ops": delta("ru_inblock"),
+            "block_output_ops": delta("ru_oublock"),
+            # Linux counts ru_oublock in 512-byte units of storage writeback, so
+            # page-cache writes not yet flushed are missed; elsewhere the unit is undefined
+            "bytes_written_estimate": delta("ru_oublock") * 512 if sys.platform.startswith("linux") else None
+        }
+    
+    def run_script_in_process(self, script_info, script_path, sink):
+        """Import a script and call its entry point, streaming its output into sink"""
+        # Per-thread usage where the OS supports it (not macOS); peak RSS is process-wide
+        if hasattr(resource, "RUSAGE_THREAD"):
+            who, scope = resource.RUSAGE_THREAD, "thread"
+        else:
+            who, scope = resource.RUSAGE_SELF, "process-wide"
+        usage_before = resource.getrusage(who)
+        # Unlike subprocess steps, nothing can stop a hung in-process step after SCRIPT_TIMEOUT
+        self.output_capture.start(sink)
+        self.error_capture.start(sink)
+        try:
+            module = load_script(script_path)
+            entry = script_info["entry"]
+            if "." in entry:
+                class_name, method_name = entry.split(".")
+                instance = getattr(module, class_name)(**script_info.get("entry_kwargs", {}))
+                returned = getattr(instance, method_name)()
+            else:
+                returned = getattr(module, entry)()
+        except (Exception, SystemExit):
+            returned = False
+            # Into the step's log and stderr tail, as a subprocess would have printed it
+            traceback.print_exc()
+        self.output_capture.stop()
+        self.error_capture.stop()
+        resources = self.usage_summary(resource.getrusage(who), usage_before, scope)
+        
+        # Entry points report failure by returning False
+        if returned is not False:
+            print(f"✅ {script_info['name']} completed successfully")
+        else:
+            print(f"❌ {script_info['name']} failed")
+        return {
+            "success": returned is not False,
+            "resources": resources
+        }
     
     def run_all_automation(self):
-        """Run all automation scripts in sequence"""
+        """Run all automation scripts, overlapping steps whose dependencies are met"""
         print("🚀 STARTING COMPLETE AUTOMATION SUITE")
         print("=" * 50)
         
@@ -108,36 +409,45 @@ class CompleteAutomationRunner:
             "scripts_run": [],
             "successful": 0,
             "failed": 0,
+            "skipped": 0,
             "total_time": 0
         }
         
         start_time = datetime.now()
+        results["execution_mode"] = self.execution_mode
+        # In-process steps can't be killed, so only subprocess steps have a timeout
+        results["step_timeout_seconds"] = SCRIPT_TIMEOUT if self.execution_mode == "subprocess" else None
+        
+        if self.execution_mode == "in-process":
+            # Steps share this process: match the subprocess cwd and split output per thread
+            os.chdir(str(self.base_path))
+            self.console = sys.stdout
+            self.output_capture = ThreadOutputCapture(sys.stdout)
+            self.error_capture = ThreadOutputCapture(sys.stderr, "stderr")
+            sys.stdout = self.output_capture
+            sys.stderr = self.error_capture
+            try:
+                timings = self.run_dependency_graph(start_time)
+            finally:
+                sys.stdout = self.output_capture.stream
+                sys.stderr = self.error_capture.stream
+        else:
+            timings = self.run_dependency_graph(start_time)
         
+        # Report in declaration order regardless of completion order
         for script_info in self.scripts:
-            script_start = datetime.now()
-            result = self.run_script(script_info)
-            script_end = datetime.now()
-            script_duration = (script_end - script_start).total_seconds()
-            
-            script_result = {
-                "name": script_info["name"],
-                "script": script_info["script"],
-                "description": script_info["description"],
-                "success": result["success"],
-                "duration": script_duration,
-                "output": result["output"],
-                "error": result["error"]
-            }
-            
+            script_result = timings[script_info["name"]]
             results["scripts_run"].append(script_result)
             
-            if result["success"]:
+            if script_result["skipped"]:
+                results["skipped"] += 1
+            elif script_result["success"]:
                 results["successful"] += 1
             else:
                 results["failed"] += 1
-            
-            print(f"   Duration: {script_duration:.2f} seconds")
-            print()
+        
+        results["critical_path"] = self.critical_path(timings)
+        results["regressions"] = self.record_history(results)
         
         end_time = datetime.now()
         results["end_time"] = end_time.isoformat()
@@ -153,9 +463,17 @@ class CompleteAutomationRunner:
         print("🎯 AUTOMATION SUITE COMPLETE")
         print(f"✅ Successful: {results['successful']}")
         print(f"❌ Failed: {results['failed']}")
+        print(f"⏭️  Skipped (unchanged): {results['skipped']}")
         print(f"⏱️  Total Time: {results['total_time']:.2f} seconds")
+        if results["step_timeout_seconds"] is None:
+            print(f"⚠️  In-process steps ran without the {SCRIPT_TIMEOUT}s per-step timeout")
+        print(f"🧭 Critical Path: {' → '.join(results['critical_path']['scripts'])} ({results['critical_path']['duration']:.2f} seconds)")
         print(f"📊 Results saved to: automation_results.json")
         
+        for regression in results["regressions"]:
+            print(f"🐢 Regression: {regression['name']} took {regression['duration']:.2f}s "
+                  f"(recent median {regression['median_duration']:.2f}s)")
+        
         if results["failed"] > 0:
             print("\n❌ FAILED SCRIPTS:")
             for script_result in results["scripts_run"]:
@@ -164,6 +482,265 @@ class CompleteAutomationRunner:
         
         return results
     
+    def run_dependency_graph(self, start_time):
+        """Run scripts concurrently up to max_workers, each once its dependencies finish"""
+        pending = {script_info["name"]: script_info for script_info in self.scripts}
+        finished = {}
+        running = {}
+        stored_fingerprints = self.load_fingerprints()
+        new_fingerprints = {}
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                skipped_any = False
+                # Start ready steps while a worker is free, so durations exclude queueing
+                for name, script_info in list(pending.items()):
+                    if len(running) >= self.max_workers:
+                        break
+                    if all(dep in finished for dep in script_info.get("depends_on", [])):
+                        del pending[name]
+                        started = (datetime.now() - start_time).total_seconds()
+                        
+                        # Make-style: rerun when inputs changed, an output is missing or a dependency ran
+                        upstream_ran = any(not finished[dep].get("skipped") for dep in script_info.get("depends_on", []))
+                        fingerprint, fresh = self.fingerprint_inputs(script_info, stored_fingerprints.get(name))
+                        new_fingerprints[name] = fingerprint
+                        if fresh and not upstream_ran and not self.force and self.outputs_exist(script_info):
+                            print(f"⏭️  Skipping {name}: inputs unchanged")
+                            finished[name] = self.step_result(script_info, {
+                                "success": True,
+                                "skipped": True,
+                                "error": "",
+                                "output": ""
+                            }, started, started)
+                            stored_fingerprints[name] = fingerprint
+                            skipped_any = True
+                            continue
+                        
+                        future = executor.submit(self.run_script, script_info)
+                        running[future] = (script_info, started)
+                
+                if not running and skipped_any:
+                    # Skipped steps may have unblocked others; look again
+                    continue
+                
+                if not running:
+                    # Remaining steps depend on unknown steps or on each other
+                    for name, script_info in pending.items():
+                        finished[name] = self.step_result(script_info, {
+                            "success": False,
+                            "error": f"Unresolvable dependencies: {script_info.get('depends_on', [])}",
+                            "output": ""
+                        }, 0, 0)
+                    break
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    script_info, started = running.pop(future)
+                    ended = (datetime.now() - start_time).total_seconds()
+                    finished[script_info["name"]] = self.step_result(script_info, future.result(), started, ended)
+                    if finished[script_info["name"]]["success"]:
+                        # Fingerprint again after the run: steps that rewrite their own inputs
+                        # (Integration Manager re-runs enhanced automation over archive/) would
+                        # otherwise look changed next time and never be skipped
+                        fingerprint, _ = self.fingerprint_inputs(script_info, new_fingerprints[script_info["name"]])
+                        stored_fingerprints[script_info["name"]] = fingerprint
+                    else:
+                        stored_fingerprints.pop(script_info["name"], None)
+                    print(f"   {script_info['name']} duration: {ended - started:.2f} seconds")
+                    print()
+        
+        self.save_fingerprints(stored_fingerprints)
+        return finished
+    
+    def load_fingerprints(self):
+        """Input fingerprints recorded for each step's last successful run"""
+        if self.fingerprints_file.exists():
+            try:
+                with open(self.fingerprints_file, 'r') as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                pass
+        return {}
+    
+    def save_fingerprints(self, fingerprints):
+        tmp_file = self.fingerprints_file.with_suffix(".tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump(fingerprints, f)
+        os.replace(tmp_file, self.fingerprints_file)
+    
+    def stat_inputs(self, script_info):
+        """[size, mtime_ns] of every file a step reads, keyed by path relative to base_path"""
+        stats = {}
+        for rel_path in [script_info["script"], *script_info.get("inputs", [])]:
+            path = os.path.normpath(self.base_path / rel_path)
+            if os.path.isfile(path):
+                st = os.stat(path)
+                stats[rel_path] = [st.st_size, st.st_mtime_ns]
+                continue
+            
+            stack = [(path, rel_path)]
+            while stack:
+                dir_path, dir_rel = stack.pop()
+                try:
+                    entries = list(os.scandir(dir_path))
+                except OSError:
+                    continue
+                for entry in entries:
+                    entry_rel = f"{dir_rel}/{entry.name}"
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in FINGERPRINT_SKIP_DIRS:
+                            stack.append((entry.path, entry_rel))
+                    elif entry.is_file():
+                        st = entry.stat()
+                        stats[entry_rel] = [st.st_size, st.st_mtime_ns]
+        return stats
+    
+    def hash_file(self, rel_path):
+        sha256_hash = hashlib.sha256()
+        with open(os.path.normpath(self.base_path / rel_path), "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                sha256_hash.update(chunk)
+        return sha256_hash.hexdigest()
+    
+    def fingerprint_inputs(self, script_info, stored):
+        """Fingerprint a step's inputs and say whether they match the stored run.
+        
+        Files whose size and mtime match reuse the stored hash; only new or
+        touched files are read, so a touched-but-identical file still counts
+        as unchanged.
+        """
+        stored = stored or {}
+        fingerprint = {}
+        fresh = True
+        for rel_path, (size, mtime_ns) in self.stat_inputs(script_info).items():
+            previous = stored.get(rel_path)
+            if previous and previous[:2] == [size, mtime_ns]:
+                fingerprint[rel_path] = previous
+                continue
+            try:
+                file_hash = self.hash_file(rel_path)
+            except OSError:
+                file_hash = None
+            fingerprint[rel_path] = [size, mtime_ns, file_hash]
+            if not previous or previous[0] != size or previous[2] != file_hash:
+                fresh = False
+        
+        if stored.keys() - fingerprint.keys():
+            fresh = False
+        return fingerprint, fresh
+    
+    def outputs_exist(self, script_info):
+        return all(os.path.exists(os.path.normpath(self.base_path / rel_path))
+                   for rel_path in script_info.get("outputs", []))
+    
+    def step_result(self, script_info, result, started, ended):
+        """Build the results entry for one step"""
+        return {
+            "name": script_info["name"],
+            "script": script_info["script"],
+            "description": script_info["description"],
+            "depends_on": script_info.get("depends_on", []),
+            "success": result["success"],
+            "skipped": result.get("skipped", False),
+            "start_offset": started,
+            "end_offset": ended,
+            "duration": ended - started,
+            "resources": result.get("resources", {}),
+            "log_file": result.get("log_file"),
+            "output_lines": result.get("output_lines", 0),
+            "output": result["output"],
+            "error": result["error"]
+        }
+    
+    def critical_path(self, timings):
+        """Longest dependency chain by measured duration"""
+        path_length = {}
+        path_previous = {}
+        
+        # A step always finishes after its dependencies, so finish order is topological
+        for step in sorted(timings.values(), key=lambda x: x["end_offset"]):
+            name = step["name"]
+            deps = [dep for dep in step["depends_on"] if dep in path_length]
+            previous = max(deps, key=lambda dep: path_length[dep], default=None)
+            path_length[name] = timings[name]["duration"] + (path_length[previous] if previous else 0)
+            path_previous[name] = previous
+        
+        name = max(path_length, key=path_length.get)
+        chain = []
+        while name:
+            chain.append(name)
+            name = path_previous[name]
+        
+        return {
+            "scripts": list(reversed(chain)),
+            "duration": max(path_length.values())
+        }
+    
+    def record_history(self, results, window=10):
+        """Append this run's per-step figures to the history and flag slow steps"""
+        history_path = self.base_path / "automation_history.jsonl"
+        previous_runs = []
+        if history_path.exists():
+            with open(history_path, 'r') as f:
+                previous_runs = [json.loads(line) for line in f if line.strip()][-window:]
+        
+        regressions = []
+        ran = [step for step in results["scripts_run"] if not step["skipped"]]
+        for step in ran:
+            past = [run["steps"][step["name"]]["duration"] for run in previous_runs
+                    if step["name"] in run["steps"] and run["steps"][step["name"]]["success"]]
+            if step["success"] and past:
+                median = statistics.median(past)
+                if step["duration"] > median * REGRESSION_FACTOR and step["duration"] - median > REGRESSION_FLOOR_SECONDS:
+                    regressions.append({
+                        "name": step["name"],
+                        "duration": step["duration"],
+                        "median_duration": median,
+                        "resources": step["resources"]
+                    })
+        
+        run_record = {
+            "start_time": results["start_time"],
+            "execution_mode": results["execution_mode"],
+            "steps": {
+                step["name"]: {
+                    "success": step["success"],
+                    "duration": step["duration"],
+                    **step["resources"]
+                }
+                for step in ran
+            }
+        }
+        with open(history_path, 'a') as f:
+            f.write(json.dumps(run_record) + "\n")
+        
+        return regressions
+    
+    def benchmark_execution_modes(self):
+        """Run the suite in both modes and record the wall-clock difference"""
+        # Both modes must do the same work, so nothing is skipped
+        self.force = True
+        timings = {}
+        for mode in ["subprocess", "in-process"]:
+            self.execution_mode = mode
+            timings[mode] = self.run_all_automation()["total_time"]
+        
+        benchmark = {
+            "benchmarked": datetime.now().isoformat(),
+            "subprocess_seconds": timings["subprocess"],
+            "in_process_seconds": timings["in-process"],
+            "seconds_saved": timings["subprocess"] - timings["in-process"]
+        }
+        
+        benchmark_path = self.base_path / "execution_mode_benchmark.json"
+        with open(benchmark_path, 'w') as f:
+            json.dump(benchmark, f, indent=2)
+        
+        print(f"\n⚡ In-process mode saved {benchmark['seconds_saved']:.2f} seconds "
+              f"({timings['subprocess']:.2f}s → {timings['in-process']:.2f}s)")
+        return benchmark
+    
     def generate_missing_forms_summary(self):
         """Generate summary of all missing forms that are now available"""
         forms_summary = {
@@ -214,7 +791,14 @@ class CompleteAutomationRunner:
 
 def main():
     """Main execution"""
-    runner = CompleteAutomationRunner()
+    runner = CompleteAutomationRunner(
+        "in-process" if "--in-process" in sys.argv else "subprocess",
+        force="--force" in sys.argv
+    )
+    
+    if "--benchmark" in sys.argv:
+        runner.benchmark_execution_modes()
+        return
     
     # Run all automation
     results = runner.run_all_automation()
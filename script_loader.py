@@ -0,0 +1,33 @@
+"""
+Script Loader
+Imports the hyphen-named automation scripts as modules so they can be run
+in-process instead of in a fresh interpreter
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+def load_script(script_path):
+    """Import an automation script by path, reusing the module once loaded"""
+    script_path = Path(script_path).resolve()
+    module_name = script_path.stem.replace("-", "_")
+
+    module = sys.modules.get(module_name)
+    if module is not None and getattr(module, "__file__", None) == str(script_path):
+        return module
+
+    # Scripts import shared helpers (form_classifier) that live beside them
+    script_dir = str(script_path.parent)
+    if script_dir not in sys.path:
+        sys.path.insert(0, script_dir)
+
+    spec = importlib.util.spec_from_file_location(module_name, script_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except Exception:
+        del sys.modules[module_name]
+        raise
+    return module
@@ -9,6 +9,9 @@ if [ ! -d "node_modules" ]; then
     npm install
 fi
 
+# Commit large evidence files as pointers, whoever runs git add
+python3 large_file_store.py install . >/dev/null 2>&1 || echo "⚠️  Large file filter not installed"
+
 # Start sync server in background
 echo "🔄 Starting sync server..."
 node sync-server.js &
@@ -5,18 +5,91 @@ Tracks all runs, forms, and system changes with detailed versioning
 """
 
 import json
+import os
+import sys
+import zlib
+import time
 import datetime
 import subprocess
 from pathlib import Path
 import hashlib
+from large_file_store import LargeFileStore, find_git_dir
+
+# Digest used for file hashes in snapshots (older snapshots used md5)
+HASH_ALGORITHM = "blake2b"
+
+# Files modified this recently are hashed but not cached: a write within the
+# same mtime tick after hashing would otherwise go unnoticed
+RACY_MTIME_SECONDS = 2
+
+# Directories left out of whole-tree snapshots (versions/ itself is always skipped)
+SNAPSHOT_SKIP_DIRS = {".git", "node_modules", "__pycache__"}
+
+# Content-defined chunking: every byte maps to one pseudo-random bit and a
+# boundary falls where the last 13 bits spell CHUNK_BOUNDARY_PATTERN, so an
+# edit only changes the chunks around it. The scan is a bytes.translate plus a
+# bytes.find per block, which keeps the per-byte work in C
+CHUNK_MIN_SIZE = 2 * 1024
+CHUNK_MAX_SIZE = 64 * 1024
+# Mixed rather than all ones, so skewed text doesn't cut a chunk every few bytes
+CHUNK_BOUNDARY_PATTERN = b"1101001110010"  # ~8 KB average chunks
+CHUNK_READ_SIZE = 1024 * 1024
+# Compaction leaves this many of the newest snapshots as loose files
+KEEP_LOOSE_VERSIONS = 20
+
+# Packed snapshots are deltas against their predecessor, with a full copy every
+# this many versions so reading one never replays a long chain
+PACK_KEYFRAME_INTERVAL = 50
+
+# Hash cache writes during a long snapshot walk, so an interrupted run keeps its hashes
+HASH_CACHE_SAVE_SECONDS = 30
+
+# Byte -> b"0" or b"1" for the chunk boundary scan
+CHUNK_BIT_TABLE = bytes(b"01"[hashlib.blake2b(bytes([i]), digest_size=1).digest()[0] & 1] for i in range(256))
 
 class VersionControl:
     def __init__(self, base_path="/Users/owner/GitHub/SYNC/case-management"):
         self.base_path = Path(base_path)
         self.versions_dir = self.base_path / "versions"
         self.versions_dir.mkdir(exist_ok=True)
+        self.hash_cache_file = self.versions_dir / "file_hash_cache.json"
+        self.hash_cache = None
+        self.hash_cache_saved = time.monotonic()
+        # Content-addressed directory objects shared by every tree snapshot
+        self.trees_dir = self.versions_dir / "trees"
+        self.tree_cache = {}
+        # Deduplicated, compressed file content: files are recipes of chunk hashes
+        self.chunks_dir = self.versions_dir / "chunks"
+        self.recipes_dir = self.versions_dir / "recipes"
+        # One JSON line per version in timestamp order, so lookups never open snapshot bodies
+        self.index_file = self.versions_dir / "version_index.jsonl"
+        # Tree root of the last auto-commit, so change checks don't need git status
+        self.commit_state_file = self.versions_dir / "last_commit_state.json"
+        # Compacted snapshots: one append-only pack plus version_id -> [offset, length, base, depth]
+        self.pack_file = self.versions_dir / "snapshots.pack"
+        self.pack_index_file = self.versions_dir / "snapshots.pack.idx"
+        self.pack_index = None
+        self.ignore_local_stores()
+        
+    def ignore_local_stores(self):
+        """Keep the chunk store, hash cache and commit state out of auto-commits.
         
-    def create_version_snapshot(self, description="Automated snapshot"):
+        They hold full file content, machine-specific inode numbers and this
+        checkout's last auto-commit; only the small version, tree and pack
+        files belong in the repository.
+        """
+        gitignore = self.versions_dir / ".gitignore"
+        existing = gitignore.read_text().splitlines() if gitignore.exists() else []
+        missing = [line for line in ["chunks/", "recipes/", "file_hash_cache.json",
+                                         "last_commit_state.json", "*.tmp"]
+                   if line not in existing]
+        if missing:
+            with open(gitignore, 'a') as f:
+                if existing and existing[-1].strip():
+                    f.write("\n")
+                f.write("\n".join(missing) + "\n")
+                
+    def create_version_snapshot(self, description="Automated snapshot", tree_snapshot=None):
         """Create a complete version snapshot"""
         try:
             timestamp = datetime.datetime.now()
@@ -32,15 +105,20 @@ class VersionControl:
                 "description": description,
                 "git_commit": git_info.get("commit"),
                 "git_branch": git_info.get("branch"),
+                "hash_algorithm": HASH_ALGORITHM,
                 "files_snapshot": self.create_files_snapshot(),
+                "tree_snapshot": tree_snapshot or self.create_tree_snapshot(),
                 "forms_generated": self.get_forms_info(),
                 "system_status": self.get_system_status()
             }
             
-            # Save version data
-            version_file = self.versions_dir / f"version_{version_id}.json"
+            # Save version data under an id no other snapshot has, loose or packed
+            version_file = self.claim_version_file(version_data)
             with open(version_file, 'w') as f:
                 json.dump(version_data, f, indent=2)
+            version_id = version_data["version_id"]
+                
+            self.append_version_index(version_data)
                 
             print(f"✅ Version snapshot created: {version_id}")
             return version_id
@@ -49,28 +127,84 @@ class VersionControl:
             print(f"❌ Version snapshot failed: {str(e)}")
             return None
             
+    def claim_version_file(self, version_data):
+        """Reserve the snapshot file for a version, suffixing _2, _3... onto taken ids.
+        
+        Ids have one-second resolution, so back-to-back snapshots (or two
+        processes) would otherwise overwrite each other's file.
+        """
+        base_id = version_data["version_id"]
+        packed_ids = self.load_pack_index()
+        suffix = 1
+        while True:
+            version_id = base_id if suffix == 1 else f"{base_id}_{suffix}"
+            version_file = self.versions_dir / f"version_{version_id}.json"
+            if version_id not in packed_ids:
+                try:
+                    # Exclusive create, so a concurrent snapshot can't take the same id
+                    with open(version_file, 'x'):
+                        pass
+                    version_data["version_id"] = version_id
+                    return version_file
+                except FileExistsError:
+                    pass
+            suffix += 1
+            
     def get_git_info(self):
-        """Get current Git information"""
+        """Get current Git information by reading .git directly"""
         try:
-            # Get current commit
-            commit_result = subprocess.run(
-                ["git", "rev-parse", "HEAD"], 
-                capture_output=True, text=True, cwd=self.base_path
-            )
-            
-            # Get current branch
-            branch_result = subprocess.run(
-                ["git", "branch", "--show-current"], 
-                capture_output=True, text=True, cwd=self.base_path
-            )
+            git_dir = self.find_git_dir()
+            if git_dir is None:
+                return {"commit": None, "branch": None}
+                
+            head = (git_dir / "HEAD").read_text().strip()
+            if head.startswith("ref: "):
+                ref = head[5:]
+                branch = ref[len("refs/heads/"):] if ref.startswith("refs/heads/") else None
+                # An unborn branch (no commits yet) has no ref to resolve
+                return {"commit": self.resolve_git_ref(git_dir, ref), "branch": branch}
+                
+            # Detached HEAD
+            return {"commit": head, "branch": None}
             
-            return {
-                "commit": commit_result.stdout.strip() if commit_result.returncode == 0 else None,
-                "branch": branch_result.stdout.strip() if branch_result.returncode == 0 else None
-            }
         except Exception as e:
             return {"commit": None, "branch": None, "error": str(e)}
             
+    def find_git_dir(self):
+        """The .git directory of the repository containing base_path"""
+        return find_git_dir(self.base_path)
+        
+    def resolve_git_ref(self, git_dir, ref, depth=0):
+        """Commit hash of a ref from its loose file or packed-refs"""
+        if depth > 5:
+            return None
+            
+        # Linked worktrees keep shared refs in the common directory
+        common_dir = git_dir
+        commondir_file = git_dir / "commondir"
+        if commondir_file.exists():
+            common_dir = (git_dir / commondir_file.read_text().strip()).resolve()
+            
+        for ref_dir in (git_dir, common_dir):
+            ref_file = ref_dir / ref
+            if ref_file.is_file():
+                value = ref_file.read_text().strip()
+                if value.startswith("ref: "):
+                    return self.resolve_git_ref(git_dir, value[5:], depth + 1)
+                return value
+                
+        packed_refs = common_dir / "packed-refs"
+        if packed_refs.exists():
+            with open(packed_refs, 'r') as f:
+                for line in f:
+                    # Skip the header and peeled-tag lines
+                    if line.startswith(("#", "^")):
+                        continue
+                    parts = line.split()
+                    if len(parts) == 2 and parts[1] == ref:
+                        return parts[0]
+        return None
+        
     def create_files_snapshot(self):
         """Create snapshot of all important files"""
         try:
@@ -88,24 +222,424 @@ class VersionControl:
             for file_name in key_files:
                 file_path = self.base_path / file_name
                 if file_path.exists():
-                    # Get file hash for change detection
-                    with open(file_path, 'rb') as f:
-                        file_hash = hashlib.md5(f.read()).hexdigest()
-                        
+                    stat = file_path.stat()
                     files_info[file_name] = {
                         "exists": True,
-                        "size": file_path.stat().st_size,
-                        "modified": datetime.datetime.fromtimestamp(file_path.stat().st_mtime).isoformat(),
-                        "hash": file_hash
+                        "size": stat.st_size,
+                        "modified": datetime.datetime.fromtimestamp(stat.st_mtime).isoformat(),
+                        "hash": self.cached_file_hash(file_path, stat)
                     }
                 else:
                     files_info[file_name] = {"exists": False}
                     
+            self.save_hash_cache()
             return files_info
             
         except Exception as e:
             return {"error": str(e)}
             
+    def load_hash_cache(self):
+        """Load the path -> [size, mtime_ns, inode, hash] cache of earlier snapshots"""
+        if self.hash_cache is None:
+            self.hash_cache = {}
+            if self.hash_cache_file.exists():
+                try:
+                    with open(self.hash_cache_file, 'r') as f:
+                        self.hash_cache = json.load(f)
+                except (OSError, ValueError):
+                    # A damaged cache only costs a rehash
+                    self.hash_cache = {}
+        return self.hash_cache
+        
+    def save_hash_cache(self):
+        if self.hash_cache is None:
+            return
+        temp_file = self.hash_cache_file.with_suffix('.tmp')
+        with open(temp_file, 'w') as f:
+            json.dump(self.hash_cache, f)
+        os.replace(temp_file, self.hash_cache_file)
+        self.hash_cache_saved = time.monotonic()
+        
+    def hash_file(self, file_path, chunk_size=1024 * 1024):
+        """Stream a file through BLAKE2b without loading it whole"""
+        file_hash = hashlib.blake2b()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                file_hash.update(chunk)
+        return file_hash.hexdigest()
+        
+    def cached_file_hash(self, file_path, stat=None):
+        """Hash a file, reusing the cached digest while its size, mtime and inode are unchanged"""
+        stat = stat or file_path.stat()
+        cache = self.load_hash_cache()
+        key = os.path.relpath(file_path, self.base_path)
+        file_stat = [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+        
+        cached = cache.get(key)
+        if cached and cached[:3] == file_stat:
+            return cached[3]
+            
+        file_hash = self.hash_file(file_path)
+        if time.time() - stat.st_mtime > RACY_MTIME_SECONDS:
+            cache[key] = file_stat + [file_hash]
+        else:
+            cache.pop(key, None)
+            
+        if time.monotonic() - self.hash_cache_saved > HASH_CACHE_SAVE_SECONDS:
+            self.save_hash_cache()
+        return file_hash
+        
+    def create_tree_snapshot(self):
+        """Snapshot the whole case-management tree as a Merkle tree of directory hashes.
+        
+        Each directory is stored once under versions/trees by the hash of its
+        entries, so unchanged subtrees are shared between versions and the
+        root hash alone identifies the whole tree.
+        """
+        try:
+            self.load_hash_cache()
+            seen = set()
+            counts = {"files": 0, "directories": 0, "new_chunks": 0, "new_chunk_bytes": 0}
+            root = self.write_tree(self.base_path, seen, counts)
+            
+            # Drop cache entries for files that no longer exist
+            self.hash_cache = {key: value for key, value in self.hash_cache.items() if key in seen}
+            self.save_hash_cache()
+            
+            return {"root": root, **counts}
+            
+        except Exception as e:
+            return {"error": str(e)}
+            
+    def write_tree(self, dir_path, seen, counts):
+        """Hash a directory bottom-up and store its tree object; returns the tree hash"""
+        entries = {}
+        with os.scandir(dir_path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name in SNAPSHOT_SKIP_DIRS or entry.path == str(self.versions_dir):
+                        continue
+                    entries[entry.name] = ["tree", self.write_tree(Path(entry.path), seen, counts)]
+                elif entry.is_file(follow_symlinks=False):
+                    stat = entry.stat(follow_symlinks=False)
+                    seen.add(os.path.relpath(entry.path, self.base_path))
+                    file_hash = self.cached_file_hash(Path(entry.path), stat)
+                    if not self.recipe_path(file_hash).exists():
+                        self.store_file_content(Path(entry.path), file_hash, counts)
+                    entries[entry.name] = ["file", file_hash, stat.st_size]
+                    counts["files"] += 1
+        counts["directories"] += 1
+        
+        data = json.dumps(entries, sort_keys=True, separators=(",", ":")).encode('utf-8')
+        tree_hash = hashlib.blake2b(data).hexdigest()
+        
+        tree_file = self.tree_path(tree_hash)
+        if not tree_file.exists():
+            tree_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = tree_file.with_suffix('.tmp')
+            with open(temp_file, 'wb') as f:
+                f.write(data)
+            os.replace(temp_file, tree_file)
+        return tree_hash
+        
+    def tree_path(self, tree_hash):
+        return self.trees_dir / tree_hash[:2] / f"{tree_hash}.json"
+        
+    def load_tree(self, tree_hash):
+        """Entries of a stored tree object: name -> ["file", hash, size] or ["tree", hash]"""
+        if tree_hash not in self.tree_cache:
+            with open(self.tree_path(tree_hash), 'r') as f:
+                self.tree_cache[tree_hash] = json.load(f)
+        return self.tree_cache[tree_hash]
+        
+    def diff_trees(self, tree1, tree2, prefix="", changes=None):
+        """Added, removed and modified files between two trees, skipping identical subtrees"""
+        changes = changes or {"added": [], "removed": [], "modified": []}
+        if tree1 == tree2:
+            return changes
+            
+        entries1 = self.load_tree(tree1)
+        entries2 = self.load_tree(tree2)
+        
+        for name in sorted(entries1.keys() | entries2.keys()):
+            entry1 = entries1.get(name)
+            entry2 = entries2.get(name)
+            path = f"{prefix}{name}"
+            
+            if entry1 == entry2:
+                continue
+            if entry1 and entry2 and entry1[0] == entry2[0] == "tree":
+                self.diff_trees(entry1[1], entry2[1], f"{path}/", changes)
+            elif entry1 and entry2 and entry1[0] == entry2[0] == "file":
+                if entry1[1] != entry2[1]:
+                    changes["modified"].append(path)
+            else:
+                # Added, removed, or replaced by a different kind of entry
+                for entry, bucket in [(entry1, "removed"), (entry2, "added")]:
+                    if entry:
+                        changes[bucket].extend(
+                            [file_path for file_path, _ in self.iter_tree_entries(entry[1], f"{path}/")]
+                            if entry[0] == "tree" else [path]
+                        )
+        return changes
+        
+    def find_chunk_boundary(self, bits, start, end):
+        """End offset of the content-defined chunk starting at start.
+        
+        bits is the buffer passed through CHUNK_BIT_TABLE; the chunk ends
+        after the first boundary pattern at least CHUNK_MIN_SIZE bytes in.
+        """
+        limit = min(end, start + CHUNK_MAX_SIZE)
+        if limit - start <= CHUNK_MIN_SIZE:
+            return limit
+            
+        found = bits.find(CHUNK_BOUNDARY_PATTERN, start + CHUNK_MIN_SIZE - len(CHUNK_BOUNDARY_PATTERN), limit)
+        return found + len(CHUNK_BOUNDARY_PATTERN) if found >= 0 else limit
+        
+    def iter_file_chunks(self, file_path):
+        """Split a file into content-defined chunks, reading it in blocks.
+        
+        Chunks are memoryviews into the current block, valid until the next
+        one is yielded.
+        """
+        with open(file_path, 'rb') as f:
+            buffer = b""
+            pos = 0
+            while True:
+                data = f.read(CHUNK_READ_SIZE)
+                if data:
+                    # Carry the unchunked tail into the next block
+                    buffer = buffer[pos:] + data
+                    bits = buffer.translate(CHUNK_BIT_TABLE)
+                    view = memoryview(buffer)
+                    pos = 0
+                while len(buffer) - pos >= CHUNK_MAX_SIZE or (pos < len(buffer) and not data):
+                    cut = self.find_chunk_boundary(bits, pos, len(buffer))
+                    yield view[pos:cut]
+                    pos = cut
+                if not data:
+                    return
+                    
+    def chunk_path(self, chunk_hash):
+        return self.chunks_dir / chunk_hash[:2] / chunk_hash
+        
+    def recipe_path(self, file_hash):
+        return self.recipes_dir / file_hash[:2] / f"{file_hash}.json"
+        
+    def write_object(self, object_path, data):
+        """Write a content-addressed object atomically"""
+        object_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = object_path.with_suffix('.tmp')
+        with open(temp_file, 'wb') as f:
+            f.write(data)
+        os.replace(temp_file, object_path)
+        
+    def store_file_content(self, file_path, file_hash, counts):
+        """Store a file's chunks (each unique chunk once, compressed) and its recipe"""
+        recipe = []
+        for chunk in self.iter_file_chunks(file_path):
+            chunk_hash = hashlib.blake2b(chunk, digest_size=32).hexdigest()
+            chunk_file = self.chunk_path(chunk_hash)
+            if not chunk_file.exists():
+                compressed = zlib.compress(chunk)
+                self.write_object(chunk_file, compressed)
+                counts["new_chunks"] += 1
+                counts["new_chunk_bytes"] += len(compressed)
+            recipe.append(chunk_hash)
+            
+        # Written last, so a recipe only exists once all its chunks do
+        self.write_object(self.recipe_path(file_hash), json.dumps(recipe).encode('utf-8'))
+        
+    def load_version(self, version_id):
+        """Load a version snapshot from its loose file or the pack, or None if it doesn't exist"""
+        version_file = self.versions_dir / f"version_{version_id}.json"
+        if version_file.exists():
+            with open(version_file, 'r') as f:
+                return json.load(f)
+        if version_id in self.load_pack_index():
+            return self.load_packed_version(version_id)
+        return None
+        
+    def load_pack_index(self):
+        if self.pack_index is None:
+            self.pack_index = {}
+            if self.pack_index_file.exists():
+                with open(self.pack_index_file, 'r') as f:
+                    self.pack_index = json.load(f)
+        return self.pack_index
+        
+    def save_pack_index(self):
+        temp_file = self.pack_index_file.with_suffix('.tmp')
+        with open(temp_file, 'w') as f:
+            json.dump(self.pack_index, f)
+        os.replace(temp_file, self.pack_index_file)
+        
+    def load_packed_version(self, version_id):
+        """Rebuild a packed snapshot by applying its deltas on top of the nearest full copy"""
+        index = self.load_pack_index()
+        chain = []
+        while version_id:
+            chain.append(index[version_id])
+            version_id = index[version_id][2]
+            
+        version_data = None
+        with open(self.pack_file, 'rb') as f:
+            for offset, length, base, depth in reversed(chain):
+                f.seek(offset)
+                record = json.loads(zlib.decompress(f.read(length)))
+                version_data = record if base is None else self.apply_delta(version_data, record)
+        return version_data
+        
+    def dict_delta(self, old, new):
+        """Changes turning dict old into dict new, recursing into nested dicts"""
+        delta = {"set": {}, "unset": [key for key in old if key not in new], "patch": {}}
+        for key, value in new.items():
+            if key not in old:
+                delta["set"][key] = value
+            elif old[key] != value:
+                if isinstance(old[key], dict) and isinstance(value, dict):
+                    delta["patch"][key] = self.dict_delta(old[key], value)
+                else:
+                    delta["set"][key] = value
+        return delta
+        
+    def apply_delta(self, old, delta):
+        new = {key: value for key, value in old.items() if key not in delta["unset"]}
+        for key, sub_delta in delta["patch"].items():
+            new[key] = self.apply_delta(old[key], sub_delta)
+        new.update(delta["set"])
+        return new
+        
+    def compact_versions(self, keep_loose=KEEP_LOOSE_VERSIONS):
+        """Delta-encode all but the newest loose snapshots into the compressed pack"""
+        try:
+            index = self.load_pack_index()
+            versions = self.versions_between()
+            to_pack = list(dict.fromkeys(
+                version["version_id"] for version in versions[:max(len(versions) - keep_loose, 0)]
+                if (self.versions_dir / f"version_{version['version_id']}.json").exists()
+            ))
+            if not to_pack:
+                print("📦 Nothing to compact")
+                return {"packed": 0}
+                
+            # Each packed snapshot is based on the version before it, packed or not
+            order = [version["version_id"] for version in versions]
+            previous_id = order[order.index(to_pack[0]) - 1] if order.index(to_pack[0]) else None
+            previous_data = self.load_version(previous_id) if previous_id else None
+            
+            loose_bytes = 0
+            with open(self.pack_file, 'ab') as f:
+                offset = f.seek(0, os.SEEK_END)
+                for version_id in to_pack:
+                    version_file = self.versions_dir / f"version_{version_id}.json"
+                    loose_bytes += version_file.stat().st_size
+                    with open(version_file, 'r') as vf:
+                        version_data = json.load(vf)
+                        
+                    base_depth = index[previous_id][3] if previous_id in index else None
+                    if previous_data is None or base_depth is None or base_depth + 1 >= PACK_KEYFRAME_INTERVAL:
+                        base, depth, record = None, 0, version_data
+                    else:
+                        base, depth, record = previous_id, base_depth + 1, self.dict_delta(previous_data, version_data)
+                        
+                    data = zlib.compress(json.dumps(record, separators=(",", ":")).encode('utf-8'), 9)
+                    f.write(data)
+                    index[version_id] = [offset, len(data), base, depth]
+                    offset += len(data)
+                    previous_id, previous_data = version_id, version_data
+                    
+                f.flush()
+                os.fsync(f.fileno())
+                
+            # Loose files are only removed once the pack and its index are durable
+            self.save_pack_index()
+            for version_id in to_pack:
+                (self.versions_dir / f"version_{version_id}.json").unlink()
+                
+            packed_bytes = sum(index[version_id][1] for version_id in to_pack)
+            print(f"📦 Packed {len(to_pack)} snapshots: {loose_bytes} → {packed_bytes} bytes")
+            return {"packed": len(to_pack), "loose_bytes": loose_bytes, "packed_bytes": packed_bytes}
+            
+        except Exception as e:
+            # Forget unsaved index entries; the loose files are still in place
+            self.pack_index = None
+            print(f"❌ Compaction failed: {str(e)}")
+            return {"error": str(e)}
+            
+    def restore_version(self, version_id, path="", destination=None):
+        """Rebuild a file or subtree as it was in a version.
+        
+        path is relative to the case-management folder ("" for everything);
+        files are written under destination (default: back in place).
+        Returns the restored file paths.
+        """
+        try:
+            version_data = self.load_version(version_id)
+            if version_data is None:
+                print(f"❌ Version not found: {version_id}")
+                return []
+            root = version_data.get("tree_snapshot", {}).get("root")
+            if not root:
+                print(f"❌ Version {version_id} has no stored content to restore")
+                return []
+                
+            # Walk down to the requested entry
+            entry = ["tree", root]
+            for part in Path(path).parts:
+                if entry[0] != "tree" or part not in self.load_tree(entry[1]):
+                    print(f"❌ {path} is not in version {version_id}")
+                    return []
+                entry = self.load_tree(entry[1])[part]
+                
+            destination = Path(destination) if destination else self.base_path
+            if entry[0] == "file":
+                files = [(path, entry[1])]
+            else:
+                prefix = f"{path}/" if path else ""
+                files = list(self.iter_tree_entries(entry[1], prefix))
+                
+            restored = []
+            for file_path, file_hash in files:
+                target = destination / file_path
+                self.restore_file(file_hash, target)
+                restored.append(str(target))
+                
+            print(f"♻️  Restored {len(restored)} files from version {version_id}")
+            return restored
+            
+        except Exception as e:
+            print(f"❌ Restore failed: {str(e)}")
+            return []
+            
+    def iter_tree_entries(self, tree_hash, prefix):
+        """(path, file hash) for every file under a tree"""
+        for name, entry in sorted(self.load_tree(tree_hash).items()):
+            if entry[0] == "tree":
+                yield from self.iter_tree_entries(entry[1], f"{prefix}{name}/")
+            else:
+                yield f"{prefix}{name}", entry[1]
+                
+    def restore_file(self, file_hash, target):
+        """Reassemble one file from its chunks, verifying it against its hash"""
+        with open(self.recipe_path(file_hash), 'r') as f:
+            recipe = json.load(f)
+            
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = target.with_name(f".{target.name}.restore")
+        check = hashlib.blake2b()
+        with open(temp_file, 'wb') as f:
+            for chunk_hash in recipe:
+                with open(self.chunk_path(chunk_hash), 'rb') as chunk_file:
+                    chunk = zlib.decompress(chunk_file.read())
+                check.update(chunk)
+                f.write(chunk)
+                
+        if check.hexdigest() != file_hash:
+            temp_file.unlink()
+            raise ValueError(f"Stored content for {target} is corrupt")
+        os.replace(temp_file, target)
+        
     def get_forms_info(self):
         """Get information about generated forms"""
         try:
@@ -150,22 +684,130 @@ class VersionControl:
         except Exception as e:
             return {"error": str(e)}
             
-    def list_versions(self):
-        """List all available versions"""
+    def index_entry(self, version_data):
+        return {
+            "version_id": version_data["version_id"],
+            "timestamp": version_data["timestamp"],
+            "description": version_data["description"],
+            "git_commit": version_data.get("git_commit")
+        }
+        
+    def append_version_index(self, version_data):
+        """Add a new version to the end of the index"""
+        if not self.index_file.exists():
+            # Built from the snapshot files, which already include this version
+            self.rebuild_version_index()
+            return
+        entry = self.index_entry(version_data)
+        
+        # The index stays sorted and unique; a version older than the newest (clock
+        # change) or one already listed forces a rebuild from the snapshot files
+        latest = self.latest_version()
+        if latest and (latest["timestamp"] > entry["timestamp"] or latest["version_id"] == entry["version_id"]):
+            self.rebuild_version_index()
+            return
+            
+        with open(self.index_file, 'ab') as f:
+            f.write((json.dumps(entry) + "\n").encode('utf-8'))
+            f.flush()
+            os.fsync(f.fileno())
+            
+    def ensure_version_index(self):
+        if not self.index_file.exists():
+            self.rebuild_version_index()
+            
+    def rebuild_version_index(self):
+        """Recreate the index from the snapshot files (migration and repair)"""
+        entries = []
+        loose_ids = set()
+        for version_file in self.versions_dir.glob("version_*.json"):
+            with open(version_file, 'r') as f:
+                entries.append(self.index_entry(json.load(f)))
+            loose_ids.add(entries[-1]["version_id"])
+        for version_id in self.load_pack_index().keys() - loose_ids:
+            entries.append(self.index_entry(self.load_packed_version(version_id)))
+        entries.sort(key=lambda x: x["timestamp"])
+        
+        temp_file = self.index_file.with_suffix('.tmp')
+        with open(temp_file, 'w') as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+        os.replace(temp_file, self.index_file)
+        
+    def summarize_version(self, entry):
+        return {**entry, "git_commit": (entry["git_commit"] or "Unknown")[:8]}
+        
+    def line_start_at_or_after(self, f, position):
+        """Offset of the first index line starting at or after position"""
+        if position == 0:
+            return 0
+        f.seek(position - 1)
+        f.readline()
+        return f.tell()
+        
+    def index_offset(self, f, size, timestamp):
+        """Binary search the index for the first line with a timestamp >= timestamp"""
+        low, high = 0, size
+        while low < high:
+            middle = (low + high) // 2
+            f.seek(self.line_start_at_or_after(f, middle))
+            line = f.readline()
+            if line and json.loads(line)["timestamp"] < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return self.line_start_at_or_after(f, low)
+        
+    def read_index_tail(self, count, block_size=65536):
+        """The last count index entries, oldest first, read backwards from the end"""
+        self.ensure_version_index()
+        with open(self.index_file, 'rb') as f:
+            position = f.seek(0, os.SEEK_END)
+            data = b""
+            while position > 0 and data.count(b"\n") <= count:
+                read_size = min(block_size, position)
+                position -= read_size
+                f.seek(position)
+                data = f.read(read_size) + data
+        lines = data.splitlines()
+        return [json.loads(line) for line in lines[-count:] if line.strip()] if count else []
+        
+    def latest_version(self):
+        """Newest version entry without reading the rest of the index"""
+        tail = self.read_index_tail(1)
+        return tail[0] if tail else None
+        
+    def versions_between(self, start=None, end=None):
+        """Versions with start <= timestamp <= end (ISO strings), oldest first"""
         try:
+            self.ensure_version_index()
             versions = []
-            for version_file in self.versions_dir.glob("version_*.json"):
-                with open(version_file, 'r') as f:
-                    version_data = json.load(f)
-                    versions.append({
-                        "version_id": version_data["version_id"],
-                        "timestamp": version_data["timestamp"],
-                        "description": version_data["description"],
-                        "git_commit": version_data.get("git_commit", "Unknown")[:8]
-                    })
-                    
-            # Sort by timestamp (newest first)
-            versions.sort(key=lambda x: x["timestamp"], reverse=True)
+            with open(self.index_file, 'rb') as f:
+                size = f.seek(0, os.SEEK_END)
+                f.seek(self.index_offset(f, size, start) if start else 0)
+                for line in f:
+                    entry = json.loads(line)
+                    if end and entry["timestamp"] > end:
+                        break
+                    versions.append(self.summarize_version(entry))
+            return versions
+            
+        except Exception as e:
+            return []
+            
+    def count_versions(self):
+        self.ensure_version_index()
+        with open(self.index_file, 'rb') as f:
+            return sum(block.count(b"\n") for block in iter(lambda: f.read(1024 * 1024), b""))
+            
+    def list_versions(self, limit=None):
+        """List available versions, newest first (only the last limit when given)"""
+        try:
+            if limit is None:
+                versions = self.versions_between()
+            else:
+                versions = [self.summarize_version(entry) for entry in self.read_index_tail(limit)]
+            versions.reverse()
             return versions
             
         except Exception as e:
@@ -174,17 +816,12 @@ class VersionControl:
     def compare_versions(self, version1_id, version2_id):
         """Compare two versions"""
         try:
-            v1_file = self.versions_dir / f"version_{version1_id}.json"
-            v2_file = self.versions_dir / f"version_{version2_id}.json"
+            v1_data = self.load_version(version1_id)
+            v2_data = self.load_version(version2_id)
             
-            if not (v1_file.exists() and v2_file.exists()):
+            if v1_data is None or v2_data is None:
                 return {"error": "One or both versions not found"}
                 
-            with open(v1_file, 'r') as f:
-                v1_data = json.load(f)
-            with open(v2_file, 'r') as f:
-                v2_data = json.load(f)
-                
             comparison = {
                 "version1": version1_id,
                 "version2": version2_id,
@@ -193,16 +830,28 @@ class VersionControl:
                 "system_changes": []
             }
             
-            # Compare files
-            v1_files = v1_data.get("files_snapshot", {})
-            v2_files = v2_data.get("files_snapshot", {})
-            
-            for file_name in set(v1_files.keys()) | set(v2_files.keys()):
-                v1_hash = v1_files.get(file_name, {}).get("hash")
-                v2_hash = v2_files.get(file_name, {}).get("hash")
+            # Whole-tree snapshots: descend only where directory hashes differ
+            v1_root = v1_data.get("tree_snapshot", {}).get("root")
+            v2_root = v2_data.get("tree_snapshot", {}).get("root")
+            if v1_root and v2_root:
+                changes = self.diff_trees(v1_root, v2_root)
+                comparison.update(changes)
+                comparison["files_changed"] = sorted(changes["added"] + changes["removed"] + changes["modified"])
+            else:
+                # Older snapshots only cover the key files
+                v1_files = v1_data.get("files_snapshot", {})
+                v2_files = v2_data.get("files_snapshot", {})
                 
-                if v1_hash != v2_hash:
-                    comparison["files_changed"].append(file_name)
+                # Digests from different algorithms never match, so fall back to size and mtime
+                same_algorithm = v1_data.get("hash_algorithm", "md5") == v2_data.get("hash_algorithm", "md5")
+                fields = ("hash",) if same_algorithm else ("exists", "size", "modified")
+                
+                for file_name in set(v1_files.keys()) | set(v2_files.keys()):
+                    v1_info = v1_files.get(file_name, {})
+                    v2_info = v2_files.get(file_name, {})
+                    
+                    if any(v1_info.get(field) != v2_info.get(field) for field in fields):
+                        comparison["files_changed"].append(file_name)
                     
             # Compare forms
             v1_forms = v1_data.get("forms_generated", {}).get("forms_generated", 0)
@@ -214,25 +863,62 @@ class VersionControl:
         except Exception as e:
             return {"error": str(e)}
             
-    def auto_version_on_changes(self):
-        """Automatically create version when significant changes detected"""
-        try:
-            # Check if there are uncommitted changes
+    def load_commit_state(self):
+        if self.commit_state_file.exists():
+            try:
+                with open(self.commit_state_file, 'r') as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                pass
+        return {}
+        
+    def save_commit_state(self, state):
+        temp_file = self.commit_state_file.with_suffix('.tmp')
+        with open(temp_file, 'w') as f:
+            json.dump(state, f, indent=2)
+        os.replace(temp_file, self.commit_state_file)
+        
+    def has_uncommitted_changes(self, tree_snapshot):
+        """Whether the tree differs from the last auto-commit, using the hash cache"""
+        if "root" not in tree_snapshot:
+            # Snapshot failed; fall back to asking git
             result = subprocess.run(
                 ["git", "status", "--porcelain"], 
                 capture_output=True, text=True, cwd=self.base_path
             )
+            return result.returncode == 0 and bool(result.stdout.strip())
+        return tree_snapshot["root"] != self.load_commit_state().get("tree_root")
+        
+    def auto_version_on_changes(self):
+        """Automatically create version when significant changes detected"""
+        try:
+            # Write .gitattributes before the snapshot, not after it, or the
+            # next run sees the attributes file as an uncommitted change
+            large_files = LargeFileStore(self.base_path)
+            if self.find_git_dir() is not None and large_files.missing_attributes():
+                large_files.install()
+            
+            # Stat-gated snapshot: only changed files are rehashed
+            tree_snapshot = self.create_tree_snapshot()
             
-            if result.returncode == 0 and result.stdout.strip():
+            if self.has_uncommitted_changes(tree_snapshot):
                 # There are changes, create version
-                version_id = self.create_version_snapshot("Auto-version: Uncommitted changes detected")
+                version_id = self.create_version_snapshot("Auto-version: Uncommitted changes detected", tree_snapshot)
                 
-                # Commit changes
-                subprocess.run(["git", "add", "."], cwd=self.base_path)
-                subprocess.run([
-                    "git", "commit", "-m", f"Auto-commit: Version {version_id}"
-                ], cwd=self.base_path)
+                # Commit changes (git is only started when there is something to commit);
+                # the large-file filter stores big evidence files as pointers
+                if self.find_git_dir() is not None:
+                    large_files.install()
+                    subprocess.run(["git", "add", "."], cwd=self.base_path)
+                    subprocess.run([
+                        "git", "commit", "-m", f"Auto-commit: Version {version_id}"
+                    ], cwd=self.base_path)
                 
+                self.save_commit_state({
+                    "tree_root": tree_snapshot.get("root"),
+                    "version_id": version_id,
+                    "committed": datetime.datetime.now().isoformat()
+                })
                 return version_id
             else:
                 print("No changes detected")
@@ -245,20 +931,20 @@ class VersionControl:
     def generate_version_report(self):
         """Generate comprehensive version report"""
         try:
-            versions = self.list_versions()
+            versions = self.list_versions(limit=5)
             
             report = f"""# Version Control Report
 Generated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
 ## Summary
-- Total Versions: {len(versions)}
+- Total Versions: {self.count_versions()}
 - Latest Version: {versions[0]['version_id'] if versions else 'None'}
 - Version Control Location: {self.versions_dir}
 
 ## Recent Versions
 """
             
-            for i, version in enumerate(versions[:5]):  # Show last 5 versions
+            for i, version in enumerate(versions):  # Show last 5 versions
                 report += f"""
 ### Version {version['version_id']}
 - **Timestamp:** {version['timestamp'][:19]}
@@ -292,9 +978,14 @@ Generated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
             print(f"Report generation failed: {str(e)}")
             return None
 
-if __name__ == "__main__":
+def main():
+    """Main execution"""
     vc = VersionControl()
     
+    if "--compact" in sys.argv:
+        vc.compact_versions()
+        return
+        
     # Create current version snapshot
     version_id = vc.create_version_snapshot("Ontario Court Forms v1.0 - Complete form set generated")
     
@@ -302,12 +993,15 @@ if __name__ == "__main__":
     vc.generate_version_report()
     
     # List all versions
-    versions = vc.list_versions()
-    print(f"\n📋 Available Versions: {len(versions)}")
+    versions = vc.list_versions(limit=10)
+    print(f"\n📋 Available Versions: {vc.count_versions()} (latest {len(versions)} shown)")
     for v in versions:
         print(f"  - {v['version_id']}: {v['description']}")
         
     # Auto-commit if changes exist
     auto_version = vc.auto_version_on_changes()
     if auto_version:
-        print(f"🔄 Auto-version created: {auto_version}")
\ No newline at end of file
+        print(f"🔄 Auto-version created: {auto_version}")
+
+if __name__ == "__main__":
+    main()